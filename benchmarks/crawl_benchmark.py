@@ -0,0 +1,69 @@
+# benchmarks/crawl_benchmark.py
+"""
+Benchmark sequential vs. concurrent crawling against the local stub server.
+
+Usage:
+    python -m benchmarks.crawl_benchmark --latency 0.2 --pages 20 --workers 1 4 8
+    python -m benchmarks.crawl_benchmark --workers 16 --adaptive --fault-rate 0.1
+"""
+
+import argparse
+import logging
+import tempfile
+import time
+
+from benchmarks.stub_server import start_stub_server
+from marketplace_crawler import MarketplaceConfig, MarketplaceCrawler, RetryPolicy
+
+
+def run(url: str, workers: int, page_size: int, rate_limit=None, adaptive=False):
+    """Crawl the stub catalog with the given worker count.
+
+    Returns elapsed seconds and the crawler's connection and throttling statistics.
+    """
+    with tempfile.TemporaryDirectory() as output_dir:
+        config = MarketplaceConfig(url=url, output_dir=output_dir, workers=workers,
+                                   rate_limit=rate_limit, adaptive_concurrency=adaptive,
+                                   retry=RetryPolicy(max_attempts=10, backoff_factor=0.1),
+                                   checkpoint_file=f'{output_dir}/checkpoint.json',
+                                   state_file=f'{output_dir}/state.json')
+        crawler = MarketplaceCrawler(config)
+        crawler.payload['filters'][0]['pageSize'] = page_size
+        start = time.perf_counter()
+        crawler.crawl()
+        elapsed = time.perf_counter() - start
+        stats = {**crawler.connection_stats(), **crawler.metrics()}
+        crawler.close()
+        return elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8])
+    parser.add_argument('--rate-limit', type=float, default=None)
+    parser.add_argument('--adaptive', action='store_true')
+    parser.add_argument('--fault-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    server, url = start_stub_server(args.latency, args.pages * args.page_size,
+                                    fault_rate=args.fault_rate, fault_status=429)
+    try:
+        baseline = None
+        for workers in args.workers:
+            elapsed, stats = run(url, workers, args.page_size, args.rate_limit, args.adaptive)
+            baseline = baseline or elapsed
+            print(f"workers={workers:<3} {elapsed:7.2f}s  speedup x{baseline / elapsed:.2f}  "
+                  f"requests={stats['requests_sent']} "
+                  f"connections={stats['connections_opened']} "
+                  f"throttled={stats['throttle_events']} "
+                  f"final_limit={stats['concurrency_limit']}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
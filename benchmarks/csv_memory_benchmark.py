@@ -0,0 +1,56 @@
+# benchmarks/csv_memory_benchmark.py
+"""
+Measure peak RSS of ExtensionDataProcessor.convert_to_csv as the catalog grows.
+
+Each size runs in a fresh interpreter; with the streaming pipeline the peak
+should stay roughly flat when the number of extensions grows 10x.
+
+Usage:
+    python -m benchmarks.csv_memory_benchmark --sizes 10000 100000
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.fixtures import write_pages
+
+
+def measure(directory: str) -> None:
+    """Convert the pages in ``directory`` to CSV and print time and peak RSS."""
+    import logging
+    from data_processor import ExtensionDataProcessor
+    logging.disable(logging.INFO)
+
+    start = time.perf_counter()
+    ExtensionDataProcessor(directory).convert_to_csv(os.path.join(directory, 'out.csv'))
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"time={elapsed:.2f}s peak_rss={peak / 1024:.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--format', default='json')
+    parser.add_argument('--measure', metavar='DIRECTORY', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure)
+        return
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            write_pages(directory, size, page_format=args.format)
+            print(f"extensions={size:<8}", end=' ', flush=True)
+            subprocess.run([sys.executable, '-m', 'benchmarks.csv_memory_benchmark',
+                            '--measure', directory], check=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/extractor_benchmark.py
+"""
+Benchmark row extraction throughput of ExtensionDataProcessor.
+
+Compares the former per-row path splitting and per-statistic scans in
+``_process_extension`` with the precompiled extractors and single-pass
+statistics index on a synthetic in-memory fixture.
+
+Usage:
+    python -m benchmarks.extractor_benchmark --extensions 100000
+"""
+
+import argparse
+import logging
+import time
+
+from benchmarks.fixtures import make_extension
+from data_processor import ExtensionDataProcessor
+from marketplace_crawler import summarize_extension
+
+
+def legacy_process_extension(field_mapping, extension):
+    """Row extraction as done before extractors were precompiled."""
+    values = []
+    for field_path in field_mapping.values():
+        if field_path.startswith('statistics_'):
+            stat_name = field_path.split('_')[1]
+            value = None
+            for stat in extension.get('statistics', []):
+                if stat.get('statisticName') == stat_name:
+                    value = stat.get('value')
+                    break
+        else:
+            value = extension
+            for key in field_path.split('_'):
+                value = value.get(key)
+                if value is None:
+                    break
+            if field_path in ['lastUpdated', 'publishedDate'] and value:
+                value = value.split('T')[0]
+        values.append(value)
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--extensions', type=int, default=100000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    extensions = [summarize_extension(make_extension(index, versions=1))
+                  for index in range(args.extensions)]
+    processor = ExtensionDataProcessor()
+    mapping = processor.fields.FIELD_MAPPING
+
+    candidates = [
+        ('split paths', lambda extension: legacy_process_extension(mapping, extension)),
+        ('compiled', processor._process_extension),
+        ('all stats', ExtensionDataProcessor(all_statistics=True)._process_extension),
+    ]
+    for name, process in candidates:
+        start = time.perf_counter()
+        for extension in extensions:
+            process(extension)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<12} {len(extensions) / elapsed:12,.0f} rows/s")
+
+
+if __name__ == '__main__':
+    main()
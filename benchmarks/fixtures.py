@@ -0,0 +1,90 @@
+# benchmarks/fixtures.py
+"""
+Synthetic marketplace data used by the benchmarks.
+
+Extensions mirror the shape returned by the extensionquery endpoint with
+``flags: 870`` (publisher, statistics, versions with files and properties).
+"""
+
+import os
+import random
+from typing import Dict, List
+
+CATEGORIES = ['Programming Languages', 'Themes', 'Snippets', 'Linters', 'Debuggers', 'Other']
+STATISTICS = ['install', 'averagerating', 'ratingcount', 'trendingdaily',
+              'trendingmonthly', 'trendingweekly', 'updateCount', 'weightedRating',
+              'downloadCount']
+ASSET_TYPES = [
+    'Microsoft.VisualStudio.Code.Manifest',
+    'Microsoft.VisualStudio.Services.Content.Changelog',
+    'Microsoft.VisualStudio.Services.Content.Details',
+    'Microsoft.VisualStudio.Services.Content.License',
+    'Microsoft.VisualStudio.Services.Icons.Default',
+    'Microsoft.VisualStudio.Services.Icons.Small',
+    'Microsoft.VisualStudio.Services.VSIXPackage',
+]
+
+
+def make_extension(index: int, versions: int = 3, seed: int = 0) -> Dict:
+    """Build a single synthetic extension record."""
+    rng = random.Random(seed * 1_000_003 + index)
+    publisher = index % 997
+    return {
+        'publisher': {
+            'publisherId': f'pub-{publisher}',
+            'publisherName': f'publisher{publisher}',
+            'displayName': f'Publisher {publisher}',
+        },
+        'extensionId': f'ext-{index}',
+        'extensionName': f'extension{index}',
+        'displayName': f'Extension {index}',
+        'shortDescription': f'Synthetic extension number {index} for benchmarks',
+        'lastUpdated': f'2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00.17Z',
+        'publishedDate': f'{rng.randint(2016, 2024)}-{rng.randint(1, 12):02d}-01T09:00:00.5Z',
+        'categories': rng.sample(CATEGORIES, 2),
+        'tags': [f'tag{rng.randint(0, 500)}' for _ in range(5)],
+        'statistics': [
+            {'statisticName': name, 'value': rng.random() * 100000}
+            for name in STATISTICS
+        ],
+        'versions': [
+            {
+                'version': f'1.0.{v}',
+                'lastUpdated': '2024-01-01T00:00:00Z',
+                'files': [
+                    {
+                        'assetType': asset_type,
+                        'source': f'https://example.invalid/ext-{index}/{v}/{asset_type}',
+                    }
+                    for asset_type in ASSET_TYPES
+                    if asset_type != ASSET_TYPES[4] or index % 3
+                ],
+                'properties': [
+                    {'key': 'Microsoft.VisualStudio.Code.Engine', 'value': '^1.80.0'},
+                    {'key': 'Microsoft.VisualStudio.Services.Content.Pricing',
+                     'value': 'Free' if index % 7 else 'Trial'},
+                ],
+            }
+            for v in range(versions)
+        ],
+    }
+
+
+def make_page(page: int, page_size: int, total: int, versions: int = 3) -> List[Dict]:
+    """Build one page of a catalog holding ``total`` extensions."""
+    start = (page - 1) * page_size
+    return [make_extension(i, versions) for i in range(start, min(start + page_size, total))]
+
+
+def write_pages(directory: str, total: int, page_size: int = 1000,
+                page_format: str = 'json') -> None:
+    """Write a crawled catalog of ``total`` summarised extensions as page files."""
+    from marketplace_crawler import summarize_extension
+    from page_storage import get_format, write_page
+
+    file_format = get_format(page_format)
+    for page in range(1, (total + page_size - 1) // page_size + 1):
+        extensions = [summarize_extension(extension)
+                      for extension in make_page(page, page_size, total, versions=1)]
+        write_page(os.path.join(directory, f'{page}{file_format.suffix}'), extensions,
+                   file_format)
@@ -0,0 +1,41 @@
+# benchmarks/parallel_load_benchmark.py
+"""
+Benchmark row extraction in ExtensionDataProcessor across worker counts.
+
+Usage:
+    python -m benchmarks.parallel_load_benchmark --extensions 70000 --workers 1 2 4 8
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from benchmarks.fixtures import write_pages
+from data_processor import ExtensionDataProcessor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--extensions', type=int, default=70000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    print(f"cpus={os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as directory:
+        write_pages(directory, args.extensions)
+        baseline = None
+        for workers in args.workers:
+            processor = ExtensionDataProcessor(directory, workers=workers)
+            start = time.perf_counter()
+            rows = sum(1 for _ in processor.iter_rows())
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"workers={workers:<3} rows={rows} {elapsed:7.2f}s "
+                  f"speedup x{baseline / elapsed:.2f}")
+
+
+if __name__ == '__main__':
+    main()
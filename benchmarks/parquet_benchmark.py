@@ -0,0 +1,62 @@
+# benchmarks/parquet_benchmark.py
+"""
+Benchmark the Parquet export against the CSV file.
+
+Writes both files from the same page files and reports file size, write
+time, and the time to read the full table and a single column back with
+pandas, as an analyst notebook would. Requires pandas and pyarrow.
+
+Usage:
+    python -m benchmarks.parquet_benchmark --extensions 70000
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.fixtures import write_pages
+from data_processor import ExtensionDataProcessor
+
+
+def timed(function, *args, **kwargs) -> float:
+    """Seconds taken by one call of ``function``."""
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--extensions', type=int, default=70000)
+    parser.add_argument('--column', default='install',
+                        help='column read back on its own')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as directory:
+        write_pages(directory, args.extensions)
+        processor = ExtensionDataProcessor(directory)
+        csv_file = os.path.join(directory, 'out.csv')
+        parquet_file = os.path.join(directory, 'out.parquet')
+
+        candidates = [
+            ('csv', csv_file, processor.convert_to_csv,
+             lambda columns=None: pd.read_csv(csv_file, usecols=columns, low_memory=False)),
+            ('parquet', parquet_file, processor.export_to_parquet,
+             lambda columns=None: pd.read_parquet(parquet_file, columns=columns)),
+        ]
+        for name, path, write, read in candidates:
+            write_time = timed(write, path)
+            size = os.path.getsize(path)
+            read_time = timed(read)
+            column_time = timed(read, [args.column])
+            print(f"{name:<8} size={size / 2 ** 20:7.2f} MiB write={write_time:.2f}s "
+                  f"read={read_time:.3f}s read[{args.column}]={column_time:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
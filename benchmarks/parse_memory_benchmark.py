@@ -0,0 +1,73 @@
+# benchmarks/parse_memory_benchmark.py
+"""
+Compare peak RSS of the buffered and streaming response parsers.
+
+A recorded-style page (1000 extensions with full ``versions``) is written to
+a temporary file, then each parser runs in a fresh interpreter so its peak
+RSS can be measured in isolation.
+
+Usage:
+    python -m benchmarks.parse_memory_benchmark --extensions 1000 --versions 20
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.fixtures import make_extension
+
+
+def measure(mode: str, fixture: str) -> None:
+    """Parse ``fixture`` with the given parser and print peak RSS growth in MiB."""
+    import logging
+    from marketplace_crawler import stream_extensions, summarize_extension
+    logging.disable(logging.INFO)
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    with open(fixture, 'rb') as f:
+        if mode == 'stream':
+            extensions = stream_extensions(f)
+        else:
+            body = json.loads(f.read())
+            extensions = [summarize_extension(extension)
+                          for extension in body['results'][0]['extensions']]
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{mode:<8} extensions={len(extensions)} time={elapsed:.2f}s "
+          f"peak_rss_growth={(peak - baseline) / 1024:.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--extensions', type=int, default=1000)
+    parser.add_argument('--versions', type=int, default=20)
+    parser.add_argument('--measure', nargs=2, metavar=('MODE', 'FIXTURE'),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure)
+        return
+
+    # ru_maxrss survives exec, so the fixture is written one extension at a
+    # time to keep this parent process (and the children's baseline) small.
+    with tempfile.NamedTemporaryFile('w', suffix='.json') as fixture:
+        fixture.write('{"results": [{"extensions": [')
+        for index in range(args.extensions):
+            fixture.write((', ' if index else '')
+                          + json.dumps(make_extension(index, args.versions)))
+        fixture.write(']}]}')
+        fixture.flush()
+        print(f"fixture size: {fixture.tell() / 2 ** 20:.1f} MiB")
+        for mode in ('buffered', 'stream'):
+            subprocess.run([sys.executable, '-m', 'benchmarks.parse_memory_benchmark',
+                            '--measure', mode, fixture.name], check=True)
+
+
+if __name__ == '__main__':
+    main()
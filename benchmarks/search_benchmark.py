@@ -0,0 +1,77 @@
+# benchmarks/search_benchmark.py
+"""
+Benchmark full-text search latency on the exported SQLite database.
+
+Exports a synthetic catalog with the FTS5 index and times typical searches
+(a rare word, a common word, a tag, a prefix and a phrase) through the
+index with bm25 ranking, against the equivalent ``LIKE`` scan over the
+flat table.
+
+Usage:
+    python -m benchmarks.search_benchmark --extensions 70000
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from contextlib import closing
+
+from benchmarks.fixtures import write_pages
+from data_processor import ExtensionDataProcessor
+from sqlite_exporter import SearchIndex
+
+# (FTS5 query, LIKE pattern) pairs
+SEARCHES = [
+    ('extension4242', '%extension4242%'),
+    ('synthetic', '%synthetic%'),
+    ('tag42', "%'tag42'%"),
+    ('extension12*', '%extension12%'),
+    ('"number 42 for"', '%number 42 for%'),
+]
+
+LIKE_SQL = ('SELECT extensionId FROM vscode_extensions '
+            'WHERE extensionDisplayName LIKE :pattern OR extensionName LIKE :pattern '
+            'OR publisherDisplayName LIKE :pattern OR shortDescription LIKE :pattern '
+            'OR tags LIKE :pattern LIMIT 20')
+
+
+def median_ms(function, repeat: int) -> float:
+    """Median wall time of ``function`` in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--extensions', type=int, default=70000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as directory:
+        write_pages(directory, args.extensions)
+        db_file = os.path.join(directory, 'search.db')
+        start = time.perf_counter()
+        ExtensionDataProcessor(directory).export_to_sqlite(db_file=db_file, search_index=True)
+        print(f"export with index: {time.perf_counter() - start:.2f}s")
+
+        index = SearchIndex()
+        with closing(sqlite3.connect(db_file)) as conn:
+            for query, pattern in SEARCHES:
+                hits = len(index.search(conn, query))
+                fts = median_ms(lambda: index.search(conn, query), args.repeat)
+                like = median_ms(lambda: conn.execute(LIKE_SQL, {'pattern': pattern}).fetchall(),
+                                 args.repeat)
+                print(f"{query:<18} hits={hits:<3} fts5={fts:8.3f} ms  like={like:8.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# benchmarks/sqlite_benchmark.py
+"""
+Benchmark the SQLite export against the former CSV + pandas round-trip.
+
+Each path runs in a fresh interpreter on the same page files and reports
+end-to-end time (from page files to a populated table) and peak RSS.
+
+Usage:
+    python -m benchmarks.sqlite_benchmark --extensions 70000
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.fixtures import write_pages
+
+
+def measure(mode: str, directory: str) -> None:
+    """Export the pages in ``directory`` with the given path and print the results."""
+    import logging
+    import sqlite3
+    from data_processor import ExtensionDataProcessor
+    logging.disable(logging.INFO)
+
+    db_file = os.path.join(directory, f'{mode}.db')
+    processor = ExtensionDataProcessor(directory)
+    start = time.perf_counter()
+    if mode == 'pandas':
+        import pandas as pd
+        csv_file = os.path.join(directory, 'out.csv')
+        processor.convert_to_csv(csv_file)
+        df = pd.read_csv(csv_file, low_memory=False)
+        with sqlite3.connect(db_file) as conn:
+            df.to_sql('vscode_extensions', conn, if_exists='replace', index=False)
+    else:
+        processor.export_to_sqlite(db_file=db_file)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{mode:<8} time={elapsed:.2f}s peak_rss={peak / 1024:.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--extensions', type=int, default=70000)
+    parser.add_argument('--measure', nargs=2, metavar=('MODE', 'DIRECTORY'),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(*args.measure)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_pages(directory, args.extensions)
+        for mode in ('pandas', 'native'):
+            subprocess.run([sys.executable, '-m', 'benchmarks.sqlite_benchmark',
+                            '--measure', mode, directory], check=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/storage_benchmark.py
+"""
+Benchmark the page storage formats over a synthetic full crawl.
+
+Reports bytes written, write time and read-back time for every format,
+next to the former ``json.dump(..., indent=4)`` layout.
+
+Usage:
+    python -m benchmarks.storage_benchmark --pages 70 --page-size 1000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.fixtures import make_page
+from marketplace_crawler import summarize_extension
+from page_storage import PAGE_FORMATS, get_format, read_page, write_page
+
+
+def write_indented(path, extensions):
+    """Write a page the way _save_extensions did before page formats existed."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(extensions, f, indent=4)
+
+
+def measure(directory, pages, writer, suffix):
+    """Write then read back every page; return bytes, write and read seconds."""
+    start = time.perf_counter()
+    for number, extensions in enumerate(pages, 1):
+        writer(os.path.join(directory, f'{number}{suffix}'), extensions)
+    write_time = time.perf_counter() - start
+
+    size = sum(entry.stat().st_size for entry in os.scandir(directory))
+
+    start = time.perf_counter()
+    for number in range(1, len(pages) + 1):
+        read_page(os.path.join(directory, f'{number}{suffix}'))
+    return size, write_time, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=70)
+    parser.add_argument('--page-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    total = args.pages * args.page_size
+    pages = [[summarize_extension(extension) for extension in make_page(page, args.page_size, total)]
+             for page in range(1, args.pages + 1)]
+
+    candidates = [('json indent=4', write_indented, '.json')]
+    for name in PAGE_FORMATS:
+        try:
+            page_format = get_format(name)
+        except ValueError as e:
+            print(f"{name:<14} skipped: {e}")
+            continue
+        candidates.append((name, lambda path, exts, fmt=page_format: write_page(path, exts, fmt),
+                           page_format.suffix))
+
+    print(f"{'format':<14} {'MiB':>8} {'write s':>8} {'read s':>8}")
+    for name, writer, suffix in candidates:
+        with tempfile.TemporaryDirectory() as directory:
+            size, write_time, read_time = measure(directory, pages, writer, suffix)
+        print(f"{name:<14} {size / 2 ** 20:8.1f} {write_time:8.2f} {read_time:8.2f}")
+
+
+if __name__ == '__main__':
+    main()
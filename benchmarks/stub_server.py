@@ -0,0 +1,114 @@
+# benchmarks/stub_server.py
+"""
+Local stand-in for the marketplace extensionquery endpoint.
+
+Serves synthetic pages (see ``fixtures``) with configurable per-request
+latency so crawler changes can be measured without touching the real API.
+A fraction of requests can be answered with a throttling or server error
+status (optionally with ``Retry-After``), or with status 200 and a truncated
+JSON body, to exercise retry handling.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+
+from benchmarks.fixtures import make_extension, make_page
+
+SORT_BY_LAST_UPDATED = 1
+FILTER_CATEGORY = 5
+
+# Body of a ``fault_status`` 200 fault: a complete response cut off mid-document
+TRUNCATED_BODY = b'{"results": [{"extensions": [{"extensionId": "ext-0", '
+
+
+class MarketplaceStubHandler(BaseHTTPRequestHandler):
+    """Answer extensionquery POSTs with synthetic pages."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length))
+        query = payload['filters'][0]
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        faults_left = (self.server.max_faults is None
+                       or self.server.faults_injected < self.server.max_faults)
+        if faults_left and random.random() < self.server.fault_rate:
+            self.server.faults_injected += 1
+            body = TRUNCATED_BODY if self.server.fault_status == 200 else b''
+            self.send_response(self.server.fault_status)
+            if self.server.retry_after is not None:
+                self.send_header('Retry-After', str(self.server.retry_after))
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        categories = [criterion['value'] for criterion in query['criteria']
+                      if criterion['filterType'] == FILTER_CATEGORY]
+        if categories or query.get('sortBy') == SORT_BY_LAST_UPDATED:
+            extensions, total = self._query_catalog(query, categories)
+        else:
+            extensions = make_page(query['pageNumber'], query['pageSize'],
+                                   self.server.total_extensions, self.server.versions)
+            total = self.server.total_extensions
+        metadata = [{'metadataType': 'ResultCount',
+                     'metadataItems': [{'name': 'TotalCount', 'count': total}]}]
+        body = json.dumps({'results': [{'extensions': extensions,
+                                        'resultMetadata': metadata}]}).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _query_catalog(self, query, categories):
+        """Slice the catalog filtered by category and/or ordered newest-first.
+
+        Returns:
+            Tuple of the requested page and the size of the filtered catalog
+        """
+        catalog = [make_extension(index, self.server.versions)
+                   for index in range(self.server.total_extensions)]
+        if categories:
+            catalog = [extension for extension in catalog
+                       if set(categories) & set(extension['categories'])]
+        if query.get('sortBy') == SORT_BY_LAST_UPDATED:
+            catalog.sort(key=lambda extension: extension['lastUpdated'], reverse=True)
+        start = (query['pageNumber'] - 1) * query['pageSize']
+        return catalog[start:start + query['pageSize']], len(catalog)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(latency: float = 0.2, total_extensions: int = 10000,
+                      versions: int = 1, fault_rate: float = 0.0, fault_status: int = 503,
+                      retry_after: Optional[float] = None,
+                      max_faults: Optional[int] = None) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Start the stub server on a free local port and return it with its URL.
+
+    At most ``max_faults`` faults are injected when given, so a ``fault_rate``
+    of 1 fails exactly the first ``max_faults`` requests.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MarketplaceStubHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.total_extensions = total_extensions
+    server.versions = versions
+    server.fault_rate = fault_rate
+    server.fault_status = fault_status
+    server.retry_after = retry_after
+    server.max_faults = max_faults
+    server.faults_injected = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f'http://{host}:{port}/extensionquery'
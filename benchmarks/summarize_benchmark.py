@@ -0,0 +1,67 @@
+# benchmarks/summarize_benchmark.py
+"""
+Micro-benchmark of per-page extension summarisation.
+
+Compares the former ``json.dumps`` substring search plus separate pricing
+pass against the single structural traversal in ``summarize_extension``.
+
+Usage:
+    python -m benchmarks.summarize_benchmark --extensions 1000 --versions 10
+"""
+
+import argparse
+import copy
+import json
+import logging
+import time
+
+from benchmarks.fixtures import make_page
+from marketplace_crawler import PRICING_PROPERTY, summarize_extension
+
+
+def legacy_summarize_extension(extension):
+    """Summarisation as done before the structural scanner."""
+    extension_str = json.dumps(extension)
+    extension['hasIcon'] = 'Microsoft.VisualStudio.Services.Icons.Default' in extension_str
+    pricing = None
+    for version in extension['versions']:
+        for prop in version.get('properties', []):
+            if prop['key'] == PRICING_PROPERTY:
+                pricing = prop['value']
+                break
+        if pricing is not None:
+            break
+    extension['pricing'] = pricing
+    extension.pop('versions', None)
+    return extension
+
+
+def time_pages(summarize, page, repeat):
+    """Return the best seconds per page over ``repeat`` runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        extensions = copy.deepcopy(page)
+        start = time.perf_counter()
+        for extension in extensions:
+            summarize(extension)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--extensions', type=int, default=1000)
+    parser.add_argument('--versions', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    page = make_page(1, args.extensions, args.extensions, args.versions)
+    for name, summarize in (('json.dumps', legacy_summarize_extension),
+                            ('structural', summarize_extension)):
+        elapsed = time_pages(summarize, page, args.repeat)
+        print(f"{name:<11} {elapsed * 1000:8.1f} ms/page  {1 / elapsed:7.1f} pages/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,18 +3,28 @@
 VSCode Extensions Data Processor
 
 This module processes crawled extension data and converts it to CSV format,
-with optional export to SQLite database.
+with optional export to SQLite database or Parquet file.
 """
 
-import json
+import argparse
+import os
+import re
 import csv
 import logging
-from typing import Dict, List, Any
-import pandas as pd
-import sqlite3
+import warnings
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 
+from page_storage import StreamStore, iter_page, list_pages, page_name
+from parquet_exporter import ParquetExporter
+from sqlite_exporter import SQLiteExporter
+from statistics_history import StatisticsHistory
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,10 +37,51 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+DATE_FIELDS = ('lastUpdated', 'publishedDate')
+
+# Marketplace statistics not exported by default
+EXTRA_STATISTICS = {
+    'trendingweekly': 'statistics_trendingweekly',
+    'weightedRating': 'statistics_weightedRating',
+    'updateCount': 'statistics_updateCount',
+}
+
+
+def _extract_key(key: str, extension: Dict[str, Any], statistics: Dict[str, Any]) -> Any:
+    return extension.get(key)
+
+
+def _extract_path(keys: Tuple[str, ...], extension: Dict[str, Any],
+                  statistics: Dict[str, Any]) -> Any:
+    value = extension
+    for key in keys:
+        value = value.get(key)
+        if value is None:
+            return None
+    return value
+
+
+def _extract_date(key: str, extension: Dict[str, Any], statistics: Dict[str, Any]) -> Any:
+    value = extension.get(key)
+    return value.split('T')[0] if value else value
+
+
+def _extract_statistic(stat_name: str, extension: Dict[str, Any],
+                       statistics: Dict[str, Any]) -> Any:
+    return statistics.get(stat_name)
+
+
+def statistics_index(extension: Dict[str, Any]) -> Dict[str, Any]:
+    """Map every statistic name of an extension to its value in a single pass."""
+    return {stat.get('statisticName'): stat.get('value')
+            for stat in extension.get('statistics', [])}
+
+
 @dataclass
 class ExtensionFields:
     """Mapping of extension fields for data extraction."""
     FIELD_MAPPING: Dict[str, str] = None
+    include_all_statistics: bool = False
 
     def __post_init__(self):
         if self.FIELD_MAPPING is None:
@@ -41,6 +92,7 @@ class ExtensionFields:
                 'extensionId': 'extensionId',
                 'extensionName': 'extensionName',
                 'extensionDisplayName': 'displayName',
+                'shortDescription': 'shortDescription',
                 'lastUpdated': 'lastUpdated',
                 'publishedDate': 'publishedDate',
                 'install': 'statistics_install',
@@ -54,105 +106,373 @@ class ExtensionFields:
                 'pricing': 'pricing',
                 'hasIcon': 'hasIcon'
             }
+        if self.include_all_statistics:
+            for column, field_path in EXTRA_STATISTICS.items():
+                self.FIELD_MAPPING.setdefault(column, field_path)
+
+    def compile_extractors(self) -> List[Callable[[Dict[str, Any], Dict[str, Any]], Any]]:
+        """
+        Compile FIELD_MAPPING into one extractor per column.
+
+        Paths are split and classified once here, so extracting a row is only
+        a series of dictionary lookups. Each extractor takes the extension and
+        its ``statistics_index``. Extractors are ``functools.partial`` objects
+        over module functions and can be pickled to worker processes.
+        """
+        extractors = []
+        for field_path in self.FIELD_MAPPING.values():
+            keys = tuple(field_path.split('_'))
+            if keys[0] == 'statistics':
+                extractors.append(partial(_extract_statistic, keys[1]))
+            elif field_path in DATE_FIELDS:
+                extractors.append(partial(_extract_date, field_path))
+            elif len(keys) == 1:
+                extractors.append(partial(_extract_key, field_path))
+            else:
+                extractors.append(partial(_extract_path, keys))
+        return extractors
 
 
 class ExtensionDataProcessor:
     """Process and convert VSCode extension data to different formats."""
 
-    def __init__(self, extensions_dir: str = 'extensions'):
+    def __init__(self, extensions_dir: str = 'extensions', workers: int = 1,
+                 all_statistics: bool = False):
         self.extensions_dir = Path(extensions_dir)
-        self.fields = ExtensionFields()
+        self.fields = ExtensionFields(include_all_statistics=all_statistics)
+        self.extractors = self.fields.compile_extractors()
+        self.workers = workers
+
+    @staticmethod
+    def _page_key(file_path: Path) -> Tuple[str, int]:
+        """Sort key splitting a page file name into its prefix and page number."""
+        name = page_name(file_path)
+        match = re.match(r'^(.*?)(\d+)$', name)
+        if match is None:
+            return name, 0
+        return match.group(1), int(match.group(2))
+
+    def _page_files(self) -> List[Path]:
+        """Page files of any supported format, in crawl order."""
+        return sorted(list_pages(self.extensions_dir), key=self._page_key)
+
+    @staticmethod
+    def _read_page(file_path: Path) -> Iterator[Dict[str, Any]]:
+        """Iterate the extensions of a page file, line by line for NDJSON files."""
+        return iter_page(file_path)
+
+    @classmethod
+    def _page_entries(cls, file_path: Path) -> List[Tuple[str, str]]:
+        """``(extensionId, lastUpdated)`` of every extension in a page file."""
+        return [(extension.get('extensionId'), (extension.get('lastUpdated') or '')[:19])
+                for extension in cls._read_page(file_path)]
+
+    def _build_index(self, files: List[Path], executor: Optional[Executor] = None
+                     ) -> Tuple[Dict[str, Tuple[str, int, int]], Dict[str, Any]]:
+        """
+        Index every extensionId to its freshest copy across the page files.
+
+        The copy with the newest ``lastUpdated`` wins; on a tie, the first
+        page copy is kept, but the last stream segment copy.
+
+        Files are read one at a time (NDJSON line by line), or in parallel on
+        ``executor``, and only ``(lastUpdated, file, position)`` is kept per
+        extension, so memory is bounded by the number of distinct extensions
+        rather than the size of the data.
+
+        Returns:
+            Tuple of the index and a duplicates/gaps report
+        """
+        index = {}
+        report = {'files': 0, 'records': 0, 'duplicates': 0, 'boundaries': [], 'shortPages': []}
+        page_sizes = []
+        previous_ids, previous_key = set(), None
+        entries = executor.map(self._page_entries, files) if executor else map(
+            self._page_entries, files)
+
+        for file_number, (file_path, page_entries) in enumerate(zip(files, entries)):
+            key = self._page_key(file_path)
+            # Stream segments are append-only, so a later copy is a later crawl
+            # and wins ties on lastUpdated (statistics change without updates)
+            appended = key[0] == StreamStore.prefix
+            ids = set()
+            count = len(page_entries)
+            for position, (extension_id, last_updated) in enumerate(page_entries):
+                ids.add(extension_id)
+                current = index.get(extension_id)
+                if current is not None:
+                    report['duplicates'] += 1
+                if (current is None or last_updated > current[0]
+                        or (appended and last_updated == current[0])):
+                    index[extension_id] = (last_updated, file_number, position)
+
+            report['files'] += 1
+            report['records'] += count
+            if key[0] == StreamStore.prefix:
+                # Stream segments are not pages, so boundaries carry no meaning
+                continue
+
+            # An extension that moved up past an already fetched page boundary
+            # shows up on both pages and pushes another extension out of view.
+            if previous_key and previous_key[0] == key[0] and previous_key[1] + 1 == key[1]:
+                overlap = len(ids & previous_ids)
+                if overlap:
+                    report['boundaries'].append({'pages': [previous_file.name, file_path.name],
+                                                 'duplicates': overlap,
+                                                 'suspectedGaps': overlap})
+            page_sizes.append((file_path.name, key, count))
+            previous_ids, previous_key, previous_file = ids, key, file_path
+
+        # Only the last page of a sequence may legitimately be short
+        page_size = {}
+        for _, key, size in page_sizes:
+            page_size[key[0]] = max(page_size.get(key[0], 0), size)
+        for (name, key, size), following in zip(page_sizes, page_sizes[1:]):
+            if size < page_size[key[0]] and following[1][0] == key[0]:
+                report['shortPages'].append({'page': name, 'extensions': size})
+
+        report['uniqueExtensions'] = len(index)
+        return index, report
+
+    def dedup_report(self) -> Dict[str, Any]:
+        """Report duplicate extensions and suspected gaps between crawled pages."""
+        return self._build_index(self._page_files())[1]
+
+    @staticmethod
+    def _log_duplicates(report: Dict[str, Any]) -> None:
+        if report['duplicates']:
+            logger.warning(f"Dropped {report['duplicates']} duplicate extensions; "
+                           f"{sum(b['suspectedGaps'] for b in report['boundaries'])} "
+                           f"suspected gaps at page boundaries")
+
+    def iter_extensions(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield each extension once, keeping the copy with the freshest lastUpdated.
+
+        A first pass indexes the page files (see ``_build_index``); a second
+        pass streams them again and yields only the winning copies.
+        """
+        files = self._page_files()
+        index, report = self._build_index(files)
+        self._log_duplicates(report)
+
+        for file_number, file_path in enumerate(files):
+            for position, extension in enumerate(self._read_page(file_path)):
+                if index[extension.get('extensionId')][1:] == (file_number, position):
+                    yield extension
 
     def load_extensions(self) -> List[Dict[str, Any]]:
-        """Load all extension data from JSON files."""
-        extensions = []
+        """Load all extension data from JSON files, de-duplicated by extensionId."""
         try:
-            for file_path in self.extensions_dir.glob('*.json'):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    extensions.extend(json.load(f))
+            extensions = list(self.iter_extensions())
             logger.info(f"Loaded {len(extensions)} extensions from JSON files")
             return extensions
         except Exception as e:
             logger.error(f"Error loading extensions: {str(e)}")
             raise
 
-    def _extract_nested_value(self, data: Dict[str, Any], path: str) -> Any:
-        """Extract value from nested dictionary using dot notation path."""
-        keys = path.split('_')
-        value = data
-        for key in keys:
-            value = value.get(key)
-            if value is None:
-                return None
-        return value
-
-    def _extract_statistic_value(self, extension: Dict[str, Any], stat_name: str) -> Any:
-        """Extract value from statistics array by statistic name."""
-        statistics = extension.get('statistics', [])
-        for stat in statistics:
-            if stat.get('statisticName') == stat_name:
-                return stat.get('value')
-        return None
-
     def _process_extension(self, extension: Dict[str, Any]) -> List[Any]:
         """Process a single extension and extract relevant values."""
-        values = []
+        statistics = statistics_index(extension)
+        return [extract(extension, statistics) for extract in self.extractors]
 
-        for field_path in self.fields.FIELD_MAPPING.values():
-            if field_path.startswith('statistics_'):
-                stat_name = field_path.split('_')[1]
-                value = self._extract_statistic_value(extension, stat_name)
-            else:
-                value = self._extract_nested_value(extension, field_path)
+    def _page_rows(self, file_path: Path, positions: Set[int]) -> List[List[Any]]:
+        """Processed rows of the extensions at ``positions`` in a page file."""
+        return [self._process_extension(extension)
+                for position, extension in enumerate(self._read_page(file_path))
+                if position in positions]
+
+    def _iter_rows_parallel(self) -> Iterator[List[Any]]:
+        """
+        Parse page files and extract rows on a process pool.
 
-                # Format dates
-                if field_path in ['lastUpdated', 'publishedDate'] and value:
-                    value = value.split('T')[0]
+        Workers return only the compact rows of the winning (de-duplicated)
+        extensions; results are consumed in file order, so the output is
+        identical to the sequential path.
+        """
+        files = self._page_files()
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            index, report = self._build_index(files, executor)
+            self._log_duplicates(report)
 
-            values.append(value)
+            positions = [set() for _ in files]
+            for _, file_number, position in index.values():
+                positions[file_number].add(position)
+            del index
 
-        return values
+            for rows in executor.map(self._page_rows, files, positions):
+                yield from rows
 
-    def convert_to_csv(self, output_file: str = 'vscode_extensions.csv') -> None:
-        """Convert extensions data to CSV format."""
+    def iter_rows(self) -> Iterator[List[Any]]:
+        """Yield one processed row per de-duplicated extension."""
+        if self.workers > 1:
+            yield from self._iter_rows_parallel()
+            return
+        for extension in self.iter_extensions():
+            yield self._process_extension(extension)
+
+    def convert_to_csv(self, output_file: str = 'vscode_extensions.csv',
+                       batch_size: int = 1000) -> None:
+        """
+        Convert extensions data to CSV format.
+
+        Rows are streamed from the page files to the CSV writer in batches of
+        ``batch_size``, so memory does not grow with the number of extensions.
+        """
         try:
-            extensions = self.load_extensions()
-            processed_data = [self._process_extension(ext) for ext in extensions]
+            total_rows = 0
+            rows = self.iter_rows()
 
             with open(output_file, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
                 writer.writerow(self.fields.FIELD_MAPPING.keys())
-                writer.writerows(processed_data)
+                while True:
+                    batch = list(islice(rows, batch_size))
+                    if not batch:
+                        break
+                    writer.writerows(batch)
+                    total_rows += len(batch)
 
-            logger.info(f"Successfully wrote {len(processed_data)} records to {output_file}")
+            logger.info(f"Successfully wrote {total_rows} records to {output_file}")
 
         except Exception as e:
             logger.error(f"Error converting to CSV: {str(e)}")
             raise
 
-    def export_to_sqlite(self, csv_file: str = 'vscode_extensions.csv',
+    def export_to_sqlite(self, csv_file: Optional[str] = None,
                          db_file: str = 'vscode_extensions.db',
-                         table_name: str = 'vscode_extensions') -> None:
-        """Export CSV data to SQLite database."""
-        try:
-            df = pd.read_csv(csv_file, low_memory=False)
+                         table_name: str = 'vscode_extensions', *,
+                         incremental: bool = False, normalized: bool = False,
+                         search_index: bool = False, publisher_summary: bool = False) -> None:
+        """
+        Export extensions data to SQLite database.
 
-            with sqlite3.connect(db_file) as conn:
-                df.to_sql(table_name, conn, if_exists='replace', index=False)
+        Rows are streamed from the page files straight into the table (see
+        ``SQLiteExporter``) without going through the CSV file.
 
-            logger.info(f"Successfully exported data to SQLite database: {db_file}")
+        Args:
+            csv_file: Deprecated and ignored; kept so positional ``db_file``
+                and ``table_name`` arguments keep their meaning
+            db_file: Path of the SQLite database
+            table_name: Name of the extensions table
+            incremental: Upsert into the existing table, writing only the rows
+                whose content changed, instead of replacing the table
+            normalized: Also fill the normalised publishers, extensions,
+                categories and tags tables
+            search_index: Also maintain an FTS5 full-text index over names,
+                descriptions and tags
+            publisher_summary: Also maintain the publisher summary and
+                extension-count histogram tables
+        """
+        if csv_file is not None:
+            warnings.warn("export_to_sqlite no longer reads csv_file; the argument is ignored",
+                          DeprecationWarning, stacklevel=2)
+        try:
+            exporter = SQLiteExporter(db_file, table_name, normalize=normalized,
+                                      search_index=search_index,
+                                      publisher_summary=publisher_summary)
+            columns = list(self.fields.FIELD_MAPPING)
+            if incremental:
+                total_rows, changed_rows = exporter.upsert(columns, self.iter_rows())
+                logger.info(f"Upserted {changed_rows} changed records out of {total_rows} "
+                            f"into SQLite database: {db_file}")
+            else:
+                total_rows = exporter.load(columns, self.iter_rows())
+                logger.info(f"Successfully exported {total_rows} records to SQLite database: "
+                            f"{db_file}")
 
         except Exception as e:
             logger.error(f"Error exporting to SQLite: {str(e)}")
             raise
 
+    def export_to_parquet(self, output_file: str = 'vscode_extensions.parquet',
+                          row_group_size: int = 65536) -> None:
+        """
+        Export extensions data to a Parquet file (requires ``pyarrow``).
+
+        Rows are streamed from the page files into typed, dictionary-encoded
+        columns, with one publication year per row group (see
+        ``ParquetExporter``).
+        """
+        try:
+            exporter = ParquetExporter(output_file, row_group_size)
+            total_rows = exporter.write(list(self.fields.FIELD_MAPPING), self.iter_rows())
+            logger.info(f"Successfully wrote {total_rows} records to {output_file}")
+
+        except Exception as e:
+            logger.error(f"Error exporting to Parquet: {str(e)}")
+            raise
+
+    def crawled_at(self) -> Optional[str]:
+        """UTC time the page files were last written, i.e. when the crawl ended."""
+        files = self._page_files()
+        if not files:
+            return None
+        modified = max(file_path.stat().st_mtime for file_path in files)
+        return datetime.fromtimestamp(modified, timezone.utc).isoformat(timespec='seconds')
+
+    def record_statistics(self, db_file: str = 'vscode_extensions.db',
+                          table_name: str = 'extension_statistics',
+                          crawled_at: Optional[str] = None) -> None:
+        """
+        Append the current statistics to the history kept in SQLite.
+
+        Only extensions whose statistics changed since the previous snapshot
+        are written (see ``StatisticsHistory``).
+
+        Args:
+            db_file: Path of the SQLite database
+            table_name: Name of the history table
+            crawled_at: Timestamp of the snapshot, defaults to the time the
+                page files were last written (see ``crawled_at``)
+        """
+        try:
+            history = StatisticsHistory(db_file, table_name)
+            crawled_at = crawled_at or self.crawled_at()
+            changed_rows = history.record(list(self.fields.FIELD_MAPPING), self.iter_rows(),
+                                          crawled_at)
+            logger.info(f"Recorded statistics changes for {changed_rows} extensions in "
+                        f"{db_file}")
+
+        except Exception as e:
+            logger.error(f"Error recording statistics history: {str(e)}")
+            raise
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description='Convert crawled extensions to CSV and SQLite.')
+    parser.add_argument('--extensions-dir', default='extensions',
+                        help='Directory holding the crawled pages')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Number of processes parsing page files')
+    parser.add_argument('--db', default='vscode_extensions.db',
+                        help='SQLite database to export to')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Upsert changed extensions instead of replacing the table')
+    parser.add_argument('--normalized', action='store_true',
+                        help='Also maintain the normalised publishers/extensions/tags tables')
+    parser.add_argument('--search-index', action='store_true',
+                        help='Also maintain the FTS5 full-text index')
+    parser.add_argument('--publisher-summary', action='store_true',
+                        help='Also maintain the publisher summary and histogram tables')
+    parser.add_argument('--record-statistics', action='store_true',
+                        help='Also append changed statistics to the history tables')
+    return parser.parse_args()
+
 
 def main():
     """Main entry point for the data processor."""
     try:
-        processor = ExtensionDataProcessor()
+        args = parse_args()
+        processor = ExtensionDataProcessor(args.extensions_dir, workers=args.workers)
         processor.convert_to_csv()
-        processor.export_to_sqlite()
+        processor.export_to_sqlite(db_file=args.db, incremental=args.incremental,
+                                   normalized=args.normalized, search_index=args.search_index,
+                                   publisher_summary=args.publisher_summary)
+        if args.record_statistics:
+            processor.record_statistics(db_file=args.db)
     except Exception as e:
         logger.error(f"Unexpected error during data processing: {str(e)}")
         raise
@@ -8,11 +8,34 @@ from the Visual Studio Code Marketplace.
 
 import os
 import json
+import copy
+import time
+import random
+import hashlib
 import logging
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 import requests
-from requests.exceptions import RequestException
+from requests.adapters import HTTPAdapter
+from requests.exceptions import (ChunkedEncodingError, ConnectionError, JSONDecodeError,
+                                 RequestException, Timeout)
+from urllib3.exceptions import HTTPError as TransportError
+from urllib3.util import make_headers
+
+from page_storage import PAGE_FORMATS, PageStore, StreamStore, get_format
+
+try:
+    import ijson
+    from ijson import JSONError
+except ImportError:  # streaming falls back to response.json()
+    ijson = None
+    JSONError = ValueError
 
 # Configure logging
 logging.basicConfig(
@@ -25,18 +48,269 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+PRICING_PROPERTY = 'Microsoft.VisualStudio.Services.Content.Pricing'
+ASSET_FLAGS = {
+    'hasIcon': 'Microsoft.VisualStudio.Services.Icons.Default',
+    'hasReadme': 'Microsoft.VisualStudio.Services.Content.Details',
+    'hasChangelog': 'Microsoft.VisualStudio.Services.Content.Changelog',
+    'hasLicense': 'Microsoft.VisualStudio.Services.Content.License',
+}
+EXTENSION_PREFIX = 'results.item.extensions.item'
+VERSIONS_PREFIX = f'{EXTENSION_PREFIX}.versions'
+SORT_BY_LAST_UPDATED = 1
+SORT_ORDER_DESCENDING = 2
+FILTER_CATEGORY = 5
+CATEGORIES = [
+    'AI', 'Azure', 'Chat', 'Data Science', 'Debuggers', 'Education', 'Extension Packs',
+    'Formatters', 'Keymaps', 'Language Packs', 'Linters', 'Machine Learning', 'Notebooks',
+    'Other', 'Programming Languages', 'SCM Providers', 'Snippets', 'Testing', 'Themes',
+    'Visualization',
+]
 
-def extension_pricing(extension):
-    try:
-        for version in extension['versions']:
-            if 'properties' not in version:
-                continue
-            for prop in version['properties']:
-                if prop['key'] == 'Microsoft.VisualStudio.Services.Content.Pricing':
-                    return prop['value']
-
-    except KeyError:
-        return None
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse a marketplace timestamp (e.g. ``2024-03-19T10:00:00.17Z``) to the second."""
+    return datetime.strptime(value[:19], '%Y-%m-%dT%H:%M:%S')
+
+
+def newest_timestamp(extensions: List[Dict], current: Optional[str] = None) -> Optional[str]:
+    """Return the most recent ``lastUpdated`` among ``extensions`` and ``current``."""
+    newest = current
+    for extension in extensions:
+        last_updated = extension.get('lastUpdated')
+        if last_updated and (newest is None
+                             or parse_timestamp(last_updated) > parse_timestamp(newest)):
+            newest = last_updated
+    return newest
+
+
+def partition_slug(category: str) -> str:
+    """Page name prefix of a category partition."""
+    return category.lower().replace(' ', '-')
+
+
+def earliest_timestamp(*values: Optional[str]) -> Optional[str]:
+    """Return the earliest of the given marketplace timestamps, ignoring missing ones."""
+    return min((value for value in values if value), key=parse_timestamp, default=None)
+
+
+def utc_timestamp() -> str:
+    """Current UTC time as a marketplace timestamp."""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def write_json_atomic(path: str, data) -> None:
+    """Write JSON to ``path`` via a temporary file so readers never see a partial file."""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4)
+    os.replace(tmp_path, path)
+
+
+def _asset_summary(asset_types: set, pricing: Optional[str]) -> Dict:
+    """Build the asset flags and pricing fields stored on each extension."""
+    summary = {flag: asset_type in asset_types for flag, asset_type in ASSET_FLAGS.items()}
+    summary['pricing'] = pricing
+    return summary
+
+
+def scan_extension_assets(extension: Dict) -> Dict:
+    """
+    Derive asset flags and pricing from an extension's versions.
+
+    Walks ``versions[*].files[*].assetType`` and ``versions[*].properties``
+    once; pricing is taken from the first version that declares it.
+    """
+    asset_types = set()
+    pricing = None
+    for version in extension.get('versions') or []:
+        for asset in version.get('files') or []:
+            asset_types.add(asset.get('assetType'))
+        if pricing is None:
+            for prop in version.get('properties') or []:
+                if prop.get('key') == PRICING_PROPERTY:
+                    pricing = prop.get('value')
+                    break
+    return _asset_summary(asset_types, pricing)
+
+
+def summarize_extension(extension: Dict) -> Dict:
+    """Add asset flags and pricing to an extension and drop its versions."""
+    extension.update(scan_extension_assets(extension))
+    extension.pop('versions', None)
+    return extension
+
+
+def stream_extensions(stream) -> List[Dict]:
+    """
+    Incrementally parse an extensionquery response body.
+
+    Every extension object is built as its events arrive, except for its
+    ``versions`` subtree, which is only scanned for asset types and the
+    pricing property and never materialised. Peak memory therefore stays
+    close to the size of the summarised page rather than the raw response.
+
+    Args:
+        stream: File-like object yielding the raw (decoded) response body
+
+    Returns:
+        Summarised extensions, equivalent to ``summarize_extension`` output
+    """
+    extensions = []
+    builder = None
+    asset_types = set()
+    pricing = None
+    property_key = None
+
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if prefix == EXTENSION_PREFIX and event == 'start_map':
+            builder = ijson.ObjectBuilder()
+            asset_types, pricing = set(), None
+        if builder is None:
+            continue
+
+        if prefix == VERSIONS_PREFIX or prefix.startswith(VERSIONS_PREFIX + '.'):
+            if prefix.endswith('.files.item.assetType'):
+                asset_types.add(value)
+            elif prefix.endswith('.properties.item.key'):
+                property_key = value
+            elif (prefix.endswith('.properties.item.value')
+                  and property_key == PRICING_PROPERTY and pricing is None):
+                pricing = value
+            continue
+        if prefix == EXTENSION_PREFIX and event == 'map_key' and value == 'versions':
+            continue
+
+        builder.event(event, value)
+        if prefix == EXTENSION_PREFIX and event == 'end_map':
+            extension = builder.value
+            extension.update(_asset_summary(asset_types, pricing))
+            extensions.append(extension)
+            builder = None
+
+    return extensions
+
+
+class PageFetchError(Exception):
+    """Raised when a page could not be fetched after all retry attempts."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retry policy for marketplace requests."""
+    max_attempts: int = 5
+    backoff_factor: float = 1.0
+    backoff_max: float = 60.0
+    jitter: bool = True
+    retry_after_max: float = 300.0
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff before retrying after ``attempt``, with full jitter."""
+        delay = min(self.backoff_max, self.backoff_factor * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before the next attempt, honouring ``Retry-After`` when given."""
+        if retry_after:
+            try:
+                seconds = float(retry_after)
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(retry_after)
+                    seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+                except (TypeError, ValueError):
+                    seconds = None
+            if seconds is not None:
+                return min(max(seconds, 0.0), self.retry_after_max)
+        return self.backoff(attempt)
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting requests per second."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a token is available and return the time spent waiting."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+class ConcurrencyController:
+    """
+    AIMD controller bounding the number of requests in flight.
+
+    When adaptive, the limit grows by one slot per ``limit`` healthy
+    responses (latency within ``target_latency``) and is halved on throttling
+    (429/5xx, connection errors), at most once per ``cooldown`` seconds.
+    Otherwise it stays at ``maximum``.
+    """
+
+    def __init__(self, maximum: int, adaptive: bool = False, minimum: int = 1,
+                 target_latency: float = 5.0, cooldown: float = 1.0, window: float = 10.0):
+        self.maximum = maximum
+        self.minimum = min(minimum, maximum)
+        self.adaptive = adaptive
+        self.target_latency = target_latency
+        self.cooldown = cooldown
+        self.window = window
+        self.limit = float(self.minimum if adaptive else maximum)
+        self.in_flight = 0
+        self.throttle_events = 0
+        self.last_decrease = 0.0
+        self.completions = deque()
+        self.condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until a request slot is free."""
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+
+    def release(self, latency: float, throttled: bool) -> None:
+        """Free a slot and adjust the limit from the request's outcome."""
+        with self.condition:
+            now = time.monotonic()
+            self.in_flight -= 1
+            self.completions.append(now)
+            if throttled:
+                self.throttle_events += 1
+                if self.adaptive and now - self.last_decrease >= self.cooldown:
+                    self.limit = max(float(self.minimum), self.limit / 2)
+                    self.last_decrease = now
+            elif self.adaptive and latency <= self.target_latency:
+                self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+            self.condition.notify_all()
+
+    def metrics(self) -> Dict[str, float]:
+        """Current request rate, in-flight count, limit and throttle events."""
+        with self.condition:
+            cutoff = time.monotonic() - self.window
+            while self.completions and self.completions[0] < cutoff:
+                self.completions.popleft()
+            return {
+                'request_rate': len(self.completions) / self.window,
+                'in_flight': self.in_flight,
+                'concurrency_limit': int(self.limit),
+                'throttle_events': self.throttle_events,
+            }
 
 
 @dataclass
@@ -44,6 +318,20 @@ class MarketplaceConfig:
     """Configuration for VSCode Marketplace API."""
     url: str = 'https://marketplace.visualstudio.com/_apis/public/gallery/extensionquery'
     headers: Dict[str, str] = None
+    output_dir: str = 'extensions'
+    workers: int = 1
+    pool_size: int = 10
+    compression: bool = True
+    stream_json: bool = True
+    state_file: str = 'crawl_state.json'
+    checkpoint_file: str = 'crawl_checkpoint.json'
+    retry: RetryPolicy = RetryPolicy()
+    page_format: str = 'json'
+    stream_store: bool = False
+    rotate_bytes: Optional[int] = 64 * 2 ** 20
+    rate_limit: Optional[float] = None
+    adaptive_concurrency: bool = False
+    target_latency: float = 5.0
 
 
 class MarketplaceCrawler:
@@ -52,7 +340,47 @@ class MarketplaceCrawler:
     def __init__(self, config: MarketplaceConfig = None):
         self.config = config or MarketplaceConfig()
         self.payload = self._get_default_payload()
+        self.session = self._create_session()
+        self.rate_limiter = TokenBucket(self.config.rate_limit) if self.config.rate_limit else None
+        self.concurrency = ConcurrencyController(max(1, self.config.workers),
+                                                 adaptive=self.config.adaptive_concurrency,
+                                                 target_latency=self.config.target_latency)
         self._setup_output_directory()
+        self.store = self._create_store()
+
+    def _create_store(self):
+        """Create the page store selected by the configuration."""
+        if self.config.stream_store:
+            return StreamStore(self.config.output_dir, self.config.rotate_bytes)
+        return PageStore(self.config.output_dir, get_format(self.config.page_format))
+
+    def _create_session(self) -> requests.Session:
+        """Create a pooled keep-alive session shared by all requests."""
+        session = requests.Session()
+        pool_size = max(self.config.pool_size, self.config.workers)
+        for prefix in ('https://', 'http://'):
+            session.mount(prefix, HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        if self.config.compression:
+            # Advertise every encoding urllib3 can decode: gzip, deflate, br (brotli is
+            # in the requirements) and zstd when zstandard is installed
+            session.headers.update(make_headers(accept_encoding=True))
+        session.headers.update(self.config.headers or {})
+        return session
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Return connections opened vs. requests sent by the session pools."""
+        stats = {'connections_opened': 0, 'requests_sent': 0}
+        for adapter in self.session.adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                stats['connections_opened'] += pool.num_connections
+                stats['requests_sent'] += pool.num_requests
+        return stats
+
+    def close(self) -> None:
+        """Close the underlying HTTP session."""
+        self.session.close()
 
     @staticmethod
     def _get_default_payload() -> Dict:
@@ -74,77 +402,506 @@ class MarketplaceCrawler:
 
     def _setup_output_directory(self) -> None:
         """Create output directory if it doesn't exist."""
-        os.makedirs('extensions', exist_ok=True)
+        os.makedirs(self.config.output_dir, exist_ok=True)
+
+    def _build_payload(self, page: int, **filter_overrides) -> Dict:
+        """Build a request payload for a specific page."""
+        payload = copy.deepcopy(self.payload)
+        payload['filters'][0].update(filter_overrides)
+        payload['filters'][0]['pageNumber'] = page
+        return payload
+
+    def _fetch_page(self, page: int, **filter_overrides) -> requests.Response:
+        """Send a single request for a page, without retries."""
+        stream = self.config.stream_json and ijson is not None
+        return self.session.post(
+            self.config.url,
+            json=self._build_payload(page, **filter_overrides),
+            timeout=30,
+            stream=stream
+        )
 
-    def _make_request(self, page: int) -> Optional[List[Dict]]:
-        """Make API request for a specific page."""
+    def _parse_response(self, response: requests.Response) -> List[Dict]:
+        """Parse and summarise the extensions of a successful response."""
+        if self.config.stream_json and ijson is not None:
+            response.raw.decode_content = True
+            return stream_extensions(response.raw)
+        extensions = response.json().get('results', [{}])[0].get('extensions', [])
+        return [summarize_extension(extension) for extension in extensions]
+
+    def _make_request(self, page: int, **filter_overrides) -> List[Dict]:
+        """
+        Make API request for a specific page and summarise its extensions.
+
+        Connection errors, timeouts, truncated bodies and the policy's
+        retriable status codes are retried with backoff; other HTTP errors
+        fail immediately. Every attempt waits for the rate limiter and a
+        concurrency slot, and reports its latency and outcome back.
+
+        Returns:
+            The page's extensions; an empty list marks the end of the catalog
+
+        Raises:
+            PageFetchError: If the page could not be fetched
+        """
+        policy = self.config.retry
+        for attempt in range(1, policy.max_attempts + 1):
+            retry_after = None
+            throttled = False
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            self.concurrency.acquire()
+            started = time.monotonic()
+            try:
+                with self._fetch_page(page, **filter_overrides) as response:
+                    throttled = response.status_code in policy.retry_statuses
+                    if throttled and attempt < policy.max_attempts:
+                        retry_after = response.headers.get('Retry-After')
+                        error = f"HTTP {response.status_code}"
+                    else:
+                        response.raise_for_status()
+                        return self._parse_response(response)
+            except (ConnectionError, Timeout) as e:
+                throttled = True
+                if attempt == policy.max_attempts:
+                    raise PageFetchError(f"Error making request for page {page}: {str(e)}") from e
+                error = str(e)
+            except (ChunkedEncodingError, TransportError, JSONError, JSONDecodeError) as e:
+                if attempt == policy.max_attempts:
+                    raise PageFetchError(f"Error making request for page {page}: {str(e)}") from e
+                error = str(e)
+            except RequestException as e:
+                raise PageFetchError(f"Error making request for page {page}: {str(e)}") from e
+            except (KeyError, IndexError) as e:
+                raise PageFetchError(f"Error parsing response for page {page}: {str(e)}") from e
+            finally:
+                self.concurrency.release(time.monotonic() - started, throttled)
+
+            delay = policy.delay(attempt, retry_after)
+            logger.warning(f"Attempt {attempt} for page {page} failed ({error}), "
+                           f"retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+        raise PageFetchError(f"Giving up on page {page} after {policy.max_attempts} attempts")
+
+    def catalog_total(self) -> Optional[int]:
+        """
+        Total number of extensions the unfiltered query matches.
+
+        Read from the ``TotalCount`` result metadata of a one-extension page.
+
+        Returns:
+            The catalog size, or None if the marketplace did not report it
+        """
         try:
-            self.payload['filters'][0]['pageNumber'] = page
-            response = requests.post(
-                self.config.url,
-                headers=self.config.headers,
-                json=self.payload,
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json().get('results', [{}])[0].get('extensions', [])
-        except RequestException as e:
-            logger.error(f"Error making request for page {page}: {str(e)}")
-            return None
-        except (KeyError, IndexError) as e:
-            logger.error(f"Error parsing response for page {page}: {str(e)}")
+            with self.session.post(self.config.url, json=self._build_payload(1, pageSize=1),
+                                   timeout=30) as response:
+                response.raise_for_status()
+                metadata = response.json()['results'][0].get('resultMetadata', [])
+        except (RequestException, ValueError, KeyError, IndexError) as e:
+            logger.warning(f"Could not read the catalog size: {str(e)}")
             return None
+        for entry in metadata:
+            if entry.get('metadataType') == 'ResultCount':
+                for item in entry.get('metadataItems', []):
+                    if item.get('name') == 'TotalCount':
+                        return item.get('count')
+        return None
+
+    def _check_coverage(self, crawled: int) -> None:
+        """Warn when a partitioned crawl found fewer extensions than the catalog holds."""
+        total = self.catalog_total()
+        if total is not None and crawled < total:
+            logger.warning(f"Partitions cover {crawled} of {total} extensions; "
+                           f"{total - crawled} extensions are in no crawled category")
 
-    def _save_extensions(self, extensions: List[Dict], page: int) -> None:
-        """Save extensions data to JSON file."""
+    def _save_extensions(self, extensions: List[Dict], page: Union[int, str]) -> None:
+        """
+        Save extensions data to the page store.
+
+        Raises:
+            OSError: If the page cannot be written; callers must not record it
+                as done
+        """
         try:
-            # Remove version information to reduce file size
-            for extension in extensions:
-                extension_str = json.dumps(extension)
-                has_icon = 'Microsoft.VisualStudio.Services.Icons.Default' in extension_str
-                extension['hasIcon'] = has_icon
-                extension['pricing'] = extension_pricing(extension)
-                extension.pop('versions', None)
-
-            output_path = os.path.join('extensions', f'{page}.json')
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(extensions, f, indent=4)
-        except IOError as e:
+            self.store.save(page, extensions)
+        except OSError as e:
             logger.error(f"Error saving extensions for page {page}: {str(e)}")
+            raise
+
+    def _load_state(self) -> Dict:
+        """Load persisted crawl state (e.g. the lastUpdated high-water mark)."""
+        try:
+            with open(self.config.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _update_state(self, **values) -> None:
+        """Merge ``values`` into the persisted crawl state."""
+        state = self._load_state()
+        state.update(values)
+        write_json_atomic(self.config.state_file, state)
+
+    def _payload_hash(self) -> str:
+        """Hash of the query payload, ignoring the page number."""
+        payload = self._build_payload(0)
+        del payload['filters'][0]['pageNumber']
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _write_checkpoint(self, page: int, total_extensions: int, newest: Optional[str],
+                          started_at: str, completed: bool = False) -> None:
+        """Atomically record crawl progress after a page has been saved."""
+        write_json_atomic(self.config.checkpoint_file, {
+            'lastPage': page,
+            'payloadHash': self._payload_hash(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'startedAt': started_at,
+            'totalExtensions': total_extensions,
+            'lastUpdated': newest,
+            'completed': completed,
+        })
+
+    def _resume_point(self) -> Tuple[int, int, Optional[str], Optional[str]]:
+        """
+        Determine where an interrupted crawl should continue.
+
+        The checkpoint is only trusted if it belongs to the current payload and
+        its crawl did not complete; saved pages up to its last page are then
+        re-validated (when the store keeps separate pages) and the crawl
+        continues after the last valid one.
+
+        Returns:
+            Tuple of next page to fetch, extensions already saved, newest
+            lastUpdated and start time of the interrupted crawl
+        """
+        try:
+            with open(self.config.checkpoint_file, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (IOError, ValueError):
+            logger.info("No usable checkpoint found, starting from page 1")
+            return 1, 0, None, None
+
+        if checkpoint.get('payloadHash') != self._payload_hash():
+            logger.warning("Checkpoint was written for a different query, starting from page 1")
+            return 1, 0, None, None
+        if checkpoint.get('completed'):
+            logger.info("Previous crawl completed, starting from page 1")
+            return 1, 0, None, None
+        started_at = checkpoint.get('startedAt')
+
+        if not self.store.addressable:
+            # Appended segments cannot be checked page by page; duplicates of a
+            # partially appended page are dropped when the store is read.
+            logger.info(f"Resuming after page {checkpoint['lastPage']}")
+            return (checkpoint['lastPage'] + 1, checkpoint.get('totalExtensions', 0),
+                    checkpoint.get('lastUpdated'), started_at)
+
+        total_extensions = 0
+        newest = None
+        for page in range(1, checkpoint.get('lastPage', 0) + 1):
+            extensions = self.store.load(page)
+            if extensions is None:
+                logger.warning(f"Saved page {page} is missing or invalid, resuming from it")
+                return page, total_extensions, newest, started_at
+            total_extensions += len(extensions)
+            newest = newest_timestamp(extensions, newest)
+
+        logger.info(f"Resuming after page {checkpoint['lastPage']} "
+                    f"({total_extensions} extensions already saved)")
+        return checkpoint['lastPage'] + 1, total_extensions, newest, started_at
+
+    def _iter_pages(self, max_pages: int, first_page: int = 1, workers: Optional[int] = None,
+                    **filter_overrides) -> Iterator[Tuple[int, List[Dict]]]:
+        """
+        Fetch pages concurrently and yield them in page order.
+
+        Up to ``workers`` pages are requested at once. An empty page is
+        yielded last and marks the end of the catalog; no further pages are
+        requested after it, so at most ``workers - 1`` pages past the end are
+        ever fetched. A page that fails after all retries raises
+        ``PageFetchError`` instead of being mistaken for the end.
+
+        Args:
+            max_pages: Maximum number of pages to fetch
+            first_page: Page to start from
+            workers: Pages requested at once (defaults to ``config.workers``)
+            **filter_overrides: Values replacing those of the default query filter
+
+        Yields:
+            Tuples of page number and its summarised extensions
+        """
+        workers = max(1, workers or self.config.workers)
+        pending = {}
+        next_page = first_page
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                for page in range(first_page, max_pages + 1):
+                    while next_page <= max_pages and len(pending) < workers:
+                        pending[next_page] = executor.submit(
+                            self._make_request, next_page, **filter_overrides)
+                        next_page += 1
+
+                    extensions = pending.pop(page).result()
+                    yield page, extensions
+                    if not extensions:
+                        break
+            finally:
+                for future in pending.values():
+                    future.cancel()
+
+    def metrics(self) -> Dict[str, float]:
+        """Request rate, in-flight count, concurrency limit and throttle events."""
+        return self.concurrency.metrics()
+
+    def _log_request_stats(self) -> None:
+        """Log connection reuse and throttling for the finished crawl."""
+        stats = self.connection_stats()
+        metrics = self.metrics()
+        logger.info(f"Sent {stats['requests_sent']} requests over "
+                    f"{stats['connections_opened']} connections "
+                    f"({metrics['throttle_events']} throttled, "
+                    f"concurrency limit {metrics['concurrency_limit']})")
 
-    def crawl(self, max_pages: int = 100) -> int:
+    def crawl(self, max_pages: int = 100, resume: bool = False) -> int:
         """
         Crawl the VSCode Marketplace for extensions.
 
+        Pages are fetched concurrently (see ``config.workers``) but written in
+        page order, exactly as a sequential crawl would, and a checkpoint is
+        written after every saved page. A crawl that reaches the end of the
+        catalog records a high-water mark for ``crawl_updates``: the newest
+        ``lastUpdated`` seen, or the crawl's start time if earlier, since an
+        extension updated mid-crawl on an already fetched page was missed.
+
         Args:
             max_pages: Maximum number of pages to crawl
+            resume: Continue after the last valid page of an interrupted crawl
 
         Returns:
             Total number of extensions crawled
+
+        Raises:
+            PageFetchError: If a page fails after all retries; the checkpoint
+                then points at the last saved page
+            OSError: If a page cannot be saved; it is not checkpointed, so a
+                resumed crawl fetches it again
         """
-        total_extensions = 0
+        first_page, total_extensions, newest, started_at = (
+            self._resume_point() if resume else (1, 0, None, None))
+        started_at = started_at or utc_timestamp()
+        if first_page == 1 and not self.store.addressable:
+            # A fresh crawl rewrites the whole catalog; appending it to the
+            # previous one would grow the stream store by a catalog per run
+            self.store.clear()
 
-        for page in range(1, max_pages + 1):
-            extensions = self._make_request(page)
+        try:
+            for page, extensions in self._iter_pages(max_pages, first_page):
+                if not extensions:
+                    logger.info(f"No more extensions found after page {page - 1}")
+                    self._write_checkpoint(page - 1, total_extensions, newest, started_at,
+                                           completed=True)
+                    self._update_state(lastUpdated=earliest_timestamp(newest, started_at))
+                    break
 
+                self._save_extensions(extensions, page)
+                total_extensions += len(extensions)
+                newest = newest_timestamp(extensions, newest)
+                logger.info(f"Crawled page {page}: Found {len(extensions)} extensions "
+                            f"(Total: {total_extensions})")
+                self._write_checkpoint(page, total_extensions, newest, started_at)
+        except (PageFetchError, OSError) as e:
+            logger.error(f"Crawl stopped after {total_extensions} extensions: {str(e)}. "
+                         f"Run again with resume to continue from the checkpoint")
+            raise
+
+        self._log_request_stats()
+        return total_extensions
+
+    def _crawl_partition(self, category: str, max_pages: int) -> Tuple[List[str], int]:
+        """Crawl a single category, saving its pages as ``{slug}-{page}``.
+
+        Returns:
+            Tuple of saved page names and number of extensions saved
+        """
+        slug = partition_slug(category)
+        criteria = self.payload['filters'][0]['criteria'] + [
+            {"filterType": FILTER_CATEGORY, "value": category}
+        ]
+        names = []
+        total_extensions = 0
+        for page, extensions in self._iter_pages(max_pages, workers=1, criteria=criteria):
             if not extensions:
-                logger.info(f"No more extensions found after page {page - 1}")
                 break
-
+            name = f'{slug}-{page}'
+            self._save_extensions(extensions, name)
+            names.append(name)
             total_extensions += len(extensions)
-            logger.info(f"Crawled page {page}: Found {len(extensions)} extensions "
-                        f"(Total: {total_extensions})")
+        logger.info(f"Crawled partition {category}: {len(names)} pages, "
+                    f"{total_extensions} extensions")
+        return names, total_extensions
+
+    def crawl_partitioned(self, max_pages: int = 100,
+                          categories: Optional[List[str]] = None) -> int:
+        """
+        Crawl the marketplace split into per-category partitions.
 
-            self._save_extensions(extensions, page)
+        Each partition is a shallow, independent pagination of one category
+        and ``config.workers`` partitions are crawled in parallel. Extensions
+        listed in several categories are then de-duplicated by
+        ``extensionId``, keeping the copy from the earliest partition in
+        ``categories`` order, so the resulting layout is deterministic.
+        Extensions outside ``categories`` are not covered; a warning is
+        logged when the crawl finds fewer extensions than the unpartitioned
+        catalog reports. Pages of the crawled categories left by a previous
+        run are deleted first, so no stale or delisted extension survives.
 
-        return total_extensions
+        Args:
+            max_pages: Maximum number of pages to crawl per partition
+            categories: Categories to crawl (defaults to ``CATEGORIES``)
+
+        Returns:
+            Number of unique extensions crawled (with a stream store, the
+            number saved before de-duplication)
+        """
+        categories = categories or CATEGORIES
+        if not self.store.addressable:
+            self.store.clear()
+        else:
+            for category in categories:
+                self.store.delete_partition(partition_slug(category))
+        with ThreadPoolExecutor(max_workers=max(1, self.config.workers)) as executor:
+            futures = [executor.submit(self._crawl_partition, category, max_pages)
+                       for category in categories]
+            try:
+                partitions = [future.result() for future in futures]
+            except PageFetchError:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        if not self.store.addressable:
+            logger.info("Partitioned crawl completed; "
+                        "duplicates are dropped when the store is read")
+            saved = sum(total for _, total in partitions)
+            # Counts include duplicates here, so only a definite shortfall is reported
+            self._check_coverage(saved)
+            self._log_request_stats()
+            return saved
+
+        seen = set()
+        for names, _ in partitions:
+            for name in names:
+                extensions = self.store.load(name) or []
+                unique = [extension for extension in extensions
+                          if extension['extensionId'] not in seen]
+                seen.update(extension['extensionId'] for extension in unique)
+                if len(unique) < len(extensions):
+                    self._save_extensions(unique, name)
+
+        logger.info(f"Partitioned crawl completed: {len(seen)} unique extensions "
+                    f"across {len(categories)} categories")
+        self._check_coverage(len(seen))
+        self._log_request_stats()
+        return len(seen)
+
+    def crawl_updates(self, max_pages: int = 100) -> int:
+        """
+        Crawl only extensions updated since the previous crawl.
+
+        Pages are requested newest-first by last update and crawling stops at
+        the first page containing an extension older than the persisted
+        high-water mark. Changed extensions are merged into the saved pages.
+        The mark only moves forward once that page is reached; if
+        ``max_pages`` runs out first, the next run fetches the same range
+        again. Without a high-water mark a full crawl is performed instead.
+
+        Args:
+            max_pages: Maximum number of pages to crawl
+
+        Returns:
+            Number of changed extensions
+
+        Raises:
+            PageFetchError: If a page fails after all retries; nothing is merged
+        """
+        high_water_mark = self._load_state().get('lastUpdated')
+        if not high_water_mark:
+            logger.info("No previous crawl state found, running a full crawl")
+            return self.crawl(max_pages)
+
+        threshold = parse_timestamp(high_water_mark)
+        changed = {}
+        reached_mark = False
+
+        for page, extensions in self._iter_pages(max_pages, sortBy=SORT_BY_LAST_UPDATED,
+                                                 sortOrder=SORT_ORDER_DESCENDING):
+            # Timestamps equal to the mark are re-fetched; merging is idempotent
+            fresh = [extension for extension in extensions
+                     if parse_timestamp(extension['lastUpdated']) >= threshold]
+            changed.update((extension['extensionId'], extension) for extension in fresh)
+            logger.info(f"Crawled update page {page}: Found {len(fresh)} changed extensions "
+                        f"(Total: {len(changed)})")
+            if len(fresh) < len(extensions) or not extensions:
+                reached_mark = True
+                break
+
+        new_page = self.store.merge(list(changed.values()))
+        if new_page is not None:
+            logger.info(f"Added new extensions as page {new_page}")
+        if reached_mark:
+            self._update_state(lastUpdated=newest_timestamp(list(changed.values()),
+                                                            high_water_mark))
+        else:
+            logger.warning(f"Stopped after {max_pages} pages before reaching extensions "
+                           f"updated before {high_water_mark}; keeping the high-water mark")
+        self._log_request_stats()
+        return len(changed)
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Crawl the VSCode Marketplace.')
+    parser.add_argument('--max-pages', type=int, default=100,
+                        help='Maximum number of pages to crawl')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of pages fetched concurrently')
+    parser.add_argument('--rate-limit', type=float, default=None,
+                        help='Maximum requests per second')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='Adapt concurrency (up to --workers) to throttling and latency')
+    parser.add_argument('--updates', action='store_true',
+                        help='Only fetch extensions updated since the previous crawl')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted crawl from its checkpoint')
+    parser.add_argument('--partitioned', action='store_true',
+                        help='Crawl category partitions in parallel and de-duplicate them')
+    parser.add_argument('--format', default='json', choices=sorted(PAGE_FORMATS),
+                        help='On-disk format of the saved pages')
+    parser.add_argument('--stream-store', action='store_true',
+                        help='Append extensions to size-rotated NDJSON segments instead of pages')
+    return parser.parse_args()
 
 
 def main():
     """Main entry point for the crawler."""
     try:
-        crawler = MarketplaceCrawler()
-        total_extensions = crawler.crawl()
+        args = parse_args()
+        crawler = MarketplaceCrawler(MarketplaceConfig(workers=args.workers,
+                                                       rate_limit=args.rate_limit,
+                                                       adaptive_concurrency=args.adaptive,
+                                                       page_format=args.format,
+                                                       stream_store=args.stream_store))
+        try:
+            if args.updates:
+                total_extensions = crawler.crawl_updates(max_pages=args.max_pages)
+            elif args.partitioned:
+                total_extensions = crawler.crawl_partitioned(max_pages=args.max_pages)
+            else:
+                total_extensions = crawler.crawl(max_pages=args.max_pages, resume=args.resume)
+        finally:
+            crawler.close()
         logger.info(f"Crawling completed. Total extensions: {total_extensions}")
     except Exception as e:
         logger.error(f"Unexpected error during crawling: {str(e)}")
@@ -0,0 +1,279 @@
+# page_storage.py
+"""
+Page Storage Formats
+
+This module reads and writes crawled extension pages in the supported
+on-disk formats: compact JSON arrays or newline-delimited JSON, each
+optionally compressed with gzip or zstd. The format of an existing page
+file is detected from its suffix. ``PageStore`` keeps one file per page,
+while ``StreamStore`` appends extensions to size-rotated NDJSON segments.
+"""
+
+import gzip
+import json
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+try:
+    import zstandard
+except ImportError:  # zstd formats are unavailable without the zstandard package
+    zstandard = None
+
+
+@dataclass(frozen=True)
+class PageFormat:
+    """On-disk layout of a page file."""
+    suffix: str
+    line_delimited: bool = False
+    compression: Optional[str] = None
+
+
+# Errors raised when reading a truncated or corrupt page file
+PAGE_READ_ERRORS = (OSError, EOFError, ValueError) + (
+    (zstandard.ZstdError,) if zstandard is not None else ())
+
+PAGE_FORMATS = {
+    'json': PageFormat('.json'),
+    'json.gz': PageFormat('.json.gz', compression='gzip'),
+    'json.zst': PageFormat('.json.zst', compression='zstd'),
+    'ndjson': PageFormat('.ndjson', line_delimited=True),
+    'ndjson.gz': PageFormat('.ndjson.gz', line_delimited=True, compression='gzip'),
+    'ndjson.zst': PageFormat('.ndjson.zst', line_delimited=True, compression='zstd'),
+}
+
+
+def get_format(name: str) -> PageFormat:
+    """Look up a page format by name, checking its compression is available."""
+    try:
+        page_format = PAGE_FORMATS[name]
+    except KeyError:
+        raise ValueError(f"Unknown page format {name!r}, expected one of "
+                         f"{', '.join(PAGE_FORMATS)}") from None
+    if page_format.compression == 'zstd' and zstandard is None:
+        raise ValueError(f"Page format {name!r} requires the zstandard package")
+    return page_format
+
+
+def detect_format(path: Union[str, Path]) -> Optional[PageFormat]:
+    """Return the format of a page file from its suffix, or None if unsupported."""
+    name = Path(path).name
+    # Longest suffix first so '.ndjson.gz' is not taken for '.gz'
+    for page_format in sorted(PAGE_FORMATS.values(), key=lambda f: -len(f.suffix)):
+        if name.endswith(page_format.suffix):
+            return page_format
+    return None
+
+
+def page_name(path: Union[str, Path]) -> str:
+    """Page name of a page file, i.e. its file name without the format suffix."""
+    name = Path(path).name
+    page_format = detect_format(name)
+    return name[:-len(page_format.suffix)] if page_format else Path(name).stem
+
+
+def list_pages(directory: Union[str, Path]) -> List[Path]:
+    """All page files in ``directory`` in a supported format."""
+    return [path for path in Path(directory).iterdir()
+            if path.is_file() and detect_format(path) is not None]
+
+
+def _open(path: Union[str, Path], mode: str, page_format: PageFormat):
+    """Open a page file as text, transparently (de)compressing it."""
+    if page_format.compression == 'gzip':
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    if page_format.compression == 'zstd':
+        if zstandard is None:
+            raise ValueError(f"Reading {path} requires the zstandard package")
+        return zstandard.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def write_page(path: Union[str, Path], extensions: List[Dict[str, Any]],
+               page_format: PageFormat) -> None:
+    """Write a page of extensions in the given format."""
+    with _open(path, 'w', page_format) as f:
+        if page_format.line_delimited:
+            for extension in extensions:
+                f.write(json.dumps(extension, separators=(',', ':')))
+                f.write('\n')
+        else:
+            json.dump(extensions, f, separators=(',', ':'))
+
+
+def iter_page(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Yield the extensions of a page file, lazily for line-delimited formats."""
+    page_format = detect_format(path) or PAGE_FORMATS['json']
+    with _open(path, 'r', page_format) as f:
+        if page_format.line_delimited:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+
+def read_page(path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """Read all extensions of a page file."""
+    return list(iter_page(path))
+
+
+class PageStore:
+    """Stores every crawled page in its own file."""
+
+    addressable = True
+
+    def __init__(self, directory: Union[str, Path], page_format: PageFormat):
+        self.directory = Path(directory)
+        self.page_format = page_format
+
+    def path(self, page: Union[int, str]) -> Path:
+        """Path of the file holding a page."""
+        return self.directory / f'{page}{self.page_format.suffix}'
+
+    def pages(self) -> List[int]:
+        """Numbers of all saved numeric pages, in order."""
+        suffix = self.page_format.suffix
+        stems = (path.name[:-len(suffix)] for path in self.directory.iterdir()
+                 if path.name.endswith(suffix))
+        return sorted(int(stem) for stem in stems if stem.isdigit())
+
+    def delete_partition(self, name: str) -> int:
+        """
+        Delete the saved pages of a partition (``{name}-{page}``) in any format.
+
+        Returns:
+            Number of page files deleted
+        """
+        pattern = re.compile(rf'{re.escape(name)}-\d+')
+        paths = [path for path in list_pages(self.directory) if pattern.fullmatch(page_name(path))]
+        for path in paths:
+            path.unlink()
+        return len(paths)
+
+    def save(self, page: Union[int, str], extensions: List[Dict[str, Any]]) -> None:
+        """Write a page, replacing any previous copy."""
+        write_page(self.path(page), extensions, self.page_format)
+
+    def load(self, page: Union[int, str]) -> Optional[List[Dict[str, Any]]]:
+        """Load a page, or None if it is missing, unreadable or empty."""
+        try:
+            extensions = read_page(self.path(page))
+        except PAGE_READ_ERRORS:
+            return None
+        return extensions if extensions else None
+
+    def merge(self, extensions: List[Dict[str, Any]]) -> Optional[int]:
+        """
+        Merge updated extensions into the saved pages.
+
+        Existing records are replaced in place by ``extensionId`` and only the
+        pages containing them are rewritten; extensions not present in any
+        page are written as a new page.
+
+        Returns:
+            Number of the page holding new extensions, if any
+        """
+        pending = {extension['extensionId']: extension for extension in extensions}
+        pages = self.pages()
+
+        for page in pages:
+            if not pending:
+                break
+            records = self.load(page) or []
+            replaced = False
+            for index, record in enumerate(records):
+                update = pending.pop(record.get('extensionId'), None)
+                if update is not None:
+                    records[index] = update
+                    replaced = True
+            if replaced:
+                self.save(page, records)
+
+        if not pending:
+            return None
+        page = (pages[-1] if pages else 0) + 1
+        self.save(page, list(pending.values()))
+        return page
+
+
+class StreamStore:
+    """
+    Appends extensions, one JSON object per line, to NDJSON segments.
+
+    A new segment (``extensions-0001.ndjson``, ``extensions-0002.ndjson``,
+    ...) is started once the current one reaches ``rotate_bytes``. Pages
+    are not addressable: updates are appended and readers keep the freshest
+    copy of each extension.
+    """
+
+    addressable = False
+    prefix = 'extensions-'
+
+    def __init__(self, directory: Union[str, Path], rotate_bytes: Optional[int] = None):
+        self.directory = Path(directory)
+        self.rotate_bytes = rotate_bytes
+        self.page_format = PAGE_FORMATS['ndjson']
+        self.lock = threading.Lock()
+
+    def _segments(self) -> List[Path]:
+        return sorted(self.directory.glob(f'{self.prefix}*{self.page_format.suffix}'))
+
+    def _current_segment(self) -> Path:
+        """Segment to append to, rotating when the latest one is full."""
+        segments = self._segments()
+        if segments and (self.rotate_bytes is None
+                         or segments[-1].stat().st_size < self.rotate_bytes):
+            return segments[-1]
+        number = int(page_name(segments[-1])[len(self.prefix):]) + 1 if segments else 1
+        return self.directory / f'{self.prefix}{number:04d}{self.page_format.suffix}'
+
+    @staticmethod
+    def _repair(segment: Path) -> None:
+        """Drop a partially written last line left by an interrupted append."""
+        with open(segment, 'rb+') as f:
+            f.seek(0, 2)
+            size = f.tell()
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                return
+            end = size
+            while end > 0:
+                start = max(0, end - 65536)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b'\n')
+                if newline != -1:
+                    f.truncate(start + newline + 1)
+                    return
+                end = start
+            f.truncate(0)
+
+    def clear(self) -> None:
+        """Remove all segments, before a fresh crawl appends the catalog again."""
+        with self.lock:
+            for segment in self._segments():
+                segment.unlink()
+
+    def save(self, page: Union[int, str], extensions: List[Dict[str, Any]]) -> None:
+        """Append a page's extensions to the current segment."""
+        with self.lock:
+            segment = self._current_segment()
+            if segment.exists():
+                self._repair(segment)
+            with open(segment, 'a', encoding='utf-8') as f:
+                for extension in extensions:
+                    f.write(json.dumps(extension, separators=(',', ':')))
+                    f.write('\n')
+
+    def load(self, page: Union[int, str]) -> Optional[List[Dict[str, Any]]]:
+        """Pages cannot be loaded back from a stream store."""
+        return None
+
+    def merge(self, extensions: List[Dict[str, Any]]) -> Optional[int]:
+        """Append updated extensions; readers keep the freshest copy."""
+        self.save('merge', extensions)
+        return None
@@ -0,0 +1,150 @@
+# parquet_exporter.py
+"""
+Parquet Exporter
+
+This module writes processed extension rows to a Parquet file with typed
+columns. Publisher names, pricing, categories and tags are dictionary
+encoded, and every row group holds extensions published in a single year,
+so readers can prune row groups by ``publishedDate``.
+"""
+
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet export is unavailable without the pyarrow package
+    pyarrow = None
+
+# Kind of every known column; unknown columns are written as strings
+COLUMN_KINDS = {
+    'publisherId': 'string',
+    'publisherName': 'dictionary',
+    'publisherDisplayName': 'dictionary',
+    'extensionId': 'string',
+    'extensionName': 'string',
+    'extensionDisplayName': 'string',
+    'shortDescription': 'string',
+    'lastUpdated': 'date',
+    'publishedDate': 'date',
+    'install': 'integer',
+    'averagerating': 'real',
+    'ratingcount': 'integer',
+    'trendingdaily': 'real',
+    'trendingmonthly': 'real',
+    'trendingweekly': 'real',
+    'weightedRating': 'real',
+    'updateCount': 'integer',
+    'downloadCount': 'integer',
+    'categories': 'dictionary_list',
+    'tags': 'dictionary_list',
+    'pricing': 'dictionary',
+    'hasIcon': 'boolean',
+}
+
+PARTITION_COLUMN = 'publishedDate'
+
+
+def _optional(convert: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    return lambda value: None if value is None or value == '' else convert(value)
+
+
+def _as_list(value: Any) -> List[Any]:
+    return value if isinstance(value, list) else [value]
+
+
+CONVERTERS = {
+    'string': _optional(str),
+    'dictionary': _optional(str),
+    'dictionary_list': _optional(_as_list),
+    'date': _optional(date.fromisoformat),
+    'integer': _optional(int),
+    'real': _optional(float),
+    'boolean': _optional(bool),
+}
+
+
+def _arrow_type(kind: str):
+    strings = pyarrow.dictionary(pyarrow.int32(), pyarrow.string())
+    return {
+        'string': pyarrow.string(),
+        'dictionary': strings,
+        'dictionary_list': pyarrow.list_(strings),
+        'date': pyarrow.date32(),
+        'integer': pyarrow.int64(),
+        'real': pyarrow.float64(),
+        'boolean': pyarrow.bool_(),
+    }[kind]
+
+
+class ParquetExporter:
+    """Stream processed extension rows into a Parquet file."""
+
+    def __init__(self, output_file: str = 'vscode_extensions.parquet',
+                 row_group_size: int = 65536, compression: str = 'zstd',
+                 max_buffered_rows: Optional[int] = None):
+        if pyarrow is None:
+            raise ValueError("Parquet export requires the pyarrow package")
+        self.output_file = output_file
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.max_buffered_rows = max_buffered_rows or 2 * row_group_size
+
+    @staticmethod
+    def schema(columns: Sequence[str]):
+        """Arrow schema for the given columns."""
+        return pyarrow.schema([(column, _arrow_type(COLUMN_KINDS.get(column, 'string')))
+                               for column in columns])
+
+    @staticmethod
+    def _partition(row: List[Any], position: Optional[int]) -> str:
+        """Publication year of a raw row, or an empty string if unknown."""
+        value = row[position] if position is not None else None
+        return value[:4] if value else ''
+
+    def _write_group(self, writer, schema, rows: List[List[Any]]) -> None:
+        """Write rows as one row group."""
+        arrays = [pyarrow.array(values, type=field.type)
+                  for field, values in zip(schema, zip(*rows))]
+        writer.write_table(pyarrow.Table.from_arrays(arrays, schema=schema),
+                           row_group_size=len(rows))
+
+    def write(self, columns: Sequence[str], rows: Iterable[List[Any]]) -> int:
+        """
+        Write ``rows`` to the Parquet file, replacing it.
+
+        Rows are buffered per publication year and each buffer is written as
+        a row group once it holds ``row_group_size`` rows. When all buffers
+        together hold ``max_buffered_rows`` rows, the largest one is written
+        early, so memory stays bounded however many years the rows span and
+        every row group still holds a single year.
+
+        Returns:
+            Number of rows written
+        """
+        columns = list(columns)
+        schema = self.schema(columns)
+        converters = [CONVERTERS[COLUMN_KINDS.get(column, 'string')] for column in columns]
+        position = columns.index(PARTITION_COLUMN) if PARTITION_COLUMN in columns else None
+        buffers: Dict[str, List[List[Any]]] = {}
+        buffered_rows = 0
+        total_rows = 0
+
+        with pyarrow.parquet.ParquetWriter(self.output_file, schema,
+                                           compression=self.compression) as writer:
+            for row in rows:
+                buffer = buffers.setdefault(self._partition(row, position), [])
+                buffer.append([convert(value) for convert, value in zip(converters, row)])
+                buffered_rows += 1
+                if buffered_rows >= self.max_buffered_rows:
+                    buffer = max(buffers.values(), key=len)
+                if len(buffer) >= self.row_group_size or buffered_rows >= self.max_buffered_rows:
+                    self._write_group(writer, schema, buffer)
+                    buffered_rows -= len(buffer)
+                    buffer.clear()
+                total_rows += 1
+            for year in sorted(buffers):
+                if buffers[year]:
+                    self._write_group(writer, schema, buffers[year])
+        return total_rows
@@ -0,0 +1,191 @@
+# query_runner.py
+"""
+Query Runner
+
+This module runs the SQL files in ``queries/`` against the exported SQLite
+database and reports, for every query, its cold and warm timings, row count
+and ``EXPLAIN QUERY PLAN`` output as JSON. Queries run in parallel, each on
+its own read-only connection. The database can first be scaled up
+synthetically to see how the queries behave on a larger catalog.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlite_exporter import PRIMARY_KEY, explain_query_plan, quote_identifier
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler('query_runner.log'),
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger(__name__)
+
+# Columns given a per-copy suffix when scaling, so copies are distinct
+# extensions of distinct publishers
+SCALED_COLUMNS = (PRIMARY_KEY, 'publisherId', 'publisherName', 'publisherDisplayName')
+
+
+@dataclass
+class QueryResult:
+    """Timings, size and plan of one query."""
+    name: str
+    file: str
+    rows: int = 0
+    cold_seconds: float = 0.0
+    warm_seconds: float = 0.0
+    warm_runs: int = 0
+    plan: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def connect_read_only(db_file: str) -> sqlite3.Connection:
+    """Open the database read-only, so a query can never modify it."""
+    return sqlite3.connect(f'{Path(db_file).resolve().as_uri()}?mode=ro', uri=True,
+                           check_same_thread=False)
+
+
+def load_queries(queries_dir: str = 'queries') -> Dict[str, str]:
+    """Map the name of every ``*.sql`` file in ``queries_dir`` to its SQL."""
+    return {path.stem: path.read_text(encoding='utf-8').strip().rstrip(';')
+            for path in sorted(Path(queries_dir).glob('*.sql'))}
+
+
+def scale_database(source: str, target: str, factor: int,
+                   table_name: str = 'vscode_extensions') -> None:
+    """
+    Write a copy of ``source`` whose table holds ``factor`` copies of every row.
+
+    Each copy gets a numeric suffix on its extension and publisher columns,
+    so the copies are distinct extensions of distinct publishers and the
+    shape of the data (extensions per publisher, value distributions) is kept.
+    """
+    with closing(sqlite3.connect(source)) as src, closing(sqlite3.connect(target)) as dst:
+        src.backup(dst)
+    with closing(sqlite3.connect(target, isolation_level=None)) as conn:
+        table = quote_identifier(table_name)
+        columns = [row[1] for row in conn.execute(f'PRAGMA table_info({table})')]
+        names = ', '.join(quote_identifier(column) for column in columns)
+        conn.execute('BEGIN')
+        # Only the original rows are copied, not the copies inserted so far
+        last_rowid = conn.execute(f'SELECT max(rowid) FROM {table}').fetchone()[0] or 0
+        for copy in range(1, factor):
+            values = ', '.join(f"{quote_identifier(column)} || '-{copy}'"
+                               if column in SCALED_COLUMNS else quote_identifier(column)
+                               for column in columns)
+            conn.execute(f'INSERT INTO {table} ({names}) '
+                         f'SELECT {values} FROM {table} WHERE rowid <= ?', (last_rowid,))
+        conn.execute('ANALYZE')
+        conn.execute('COMMIT')
+
+
+def run_query(db_file: str, name: str, sql: str, repeat: int = 5) -> QueryResult:
+    """
+    Time one query on its own read-only connection.
+
+    The cold timing is the first execution on a fresh connection, with an
+    empty SQLite page cache (the operating system cache is not dropped); the
+    warm timing is the median of ``repeat`` further executions.
+    """
+    result = QueryResult(name=name, file=f'{name}.sql')
+    try:
+        with closing(connect_read_only(db_file)) as conn:
+            result.plan = explain_query_plan(conn, sql)
+
+        with closing(connect_read_only(db_file)) as conn:
+            start = time.perf_counter()
+            result.rows = len(conn.execute(sql).fetchall())
+            result.cold_seconds = time.perf_counter() - start
+
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                conn.execute(sql).fetchall()
+                timings.append(time.perf_counter() - start)
+            result.warm_seconds = statistics.median(timings) if timings else 0.0
+            result.warm_runs = len(timings)
+    except sqlite3.Error as e:
+        logger.error(f"Error running query {name}: {str(e)}")
+        result.error = str(e)
+    return result
+
+
+def run_queries(db_file: str, queries: Dict[str, str], repeat: int = 5,
+                workers: int = 1) -> List[QueryResult]:
+    """Run every query, ``workers`` at a time, and return the results in query order."""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_query, db_file, name, sql, repeat)
+                   for name, sql in queries.items()]
+        return [future.result() for future in futures]
+
+
+def build_report(db_file: str, results: List[QueryResult], scale: int = 1) -> Dict[str, Any]:
+    """Machine-readable report of a run."""
+    return {
+        'database': db_file,
+        'scale': scale,
+        'sqlite_version': sqlite3.sqlite_version,
+        'queries': [asdict(result) for result in results],
+    }
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Run and time the queries in queries/.')
+    parser.add_argument('--db', default='vscode_extensions.db',
+                        help='SQLite database exported by the data processor')
+    parser.add_argument('--queries', default='queries',
+                        help='Directory holding the *.sql files')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Number of warm executions per query')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Number of queries run in parallel')
+    parser.add_argument('--scale', type=int, default=1,
+                        help='Run against a synthetic copy holding this many copies of the catalog')
+    parser.add_argument('--scaled-db', default=None,
+                        help='Where to write the scaled database (default: next to --db)')
+    parser.add_argument('--output', default=None,
+                        help='Write the JSON report to this file instead of stdout')
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point for the query runner."""
+    try:
+        args = parse_args()
+        db_file = args.db
+        if args.scale > 1:
+            db_file = args.scaled_db or str(Path(args.db).with_suffix(f'.x{args.scale}.db'))
+            logger.info(f"Building {args.scale}x database {db_file}")
+            scale_database(args.db, db_file, args.scale)
+
+        queries = load_queries(args.queries)
+        results = run_queries(db_file, queries, args.repeat, args.workers)
+        report = json.dumps(build_report(db_file, results, args.scale), indent=2)
+        if args.output:
+            Path(args.output).write_text(report + '\n', encoding='utf-8')
+            logger.info(f"Wrote report for {len(results)} queries to {args.output}")
+        else:
+            sys.stdout.write(report + '\n')
+    except Exception as e:
+        logger.error(f"Unexpected error while running queries: {str(e)}")
+        raise
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,638 @@
+# sqlite_exporter.py
+"""
+SQLite Exporter
+
+This module bulk loads processed extension rows into a SQLite database,
+streaming them with ``executemany`` inside a single transaction under
+pragmas tuned for bulk loading. The table is keyed on ``extensionId`` and
+indexed for the queries shipped in ``queries/``. Each row carries a hash of
+its content, so later exports can upsert only the rows that changed.
+Optionally the same pass also fills a normalised schema, with publishers,
+categories and tags in tables of their own, an FTS5 full-text index and
+trigger-maintained publisher rollups.
+"""
+
+import hashlib
+import logging
+import sqlite3
+from contextlib import closing
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+COLUMN_TYPES = {
+    'publisherId': 'TEXT',
+    'publisherName': 'TEXT',
+    'publisherDisplayName': 'TEXT',
+    'extensionId': 'TEXT',
+    'extensionName': 'TEXT',
+    'extensionDisplayName': 'TEXT',
+    'shortDescription': 'TEXT',
+    'lastUpdated': 'TEXT',
+    'publishedDate': 'TEXT',
+    'install': 'INTEGER',
+    'averagerating': 'REAL',
+    'ratingcount': 'INTEGER',
+    'trendingdaily': 'REAL',
+    'trendingmonthly': 'REAL',
+    'trendingweekly': 'REAL',
+    'weightedRating': 'REAL',
+    'updateCount': 'INTEGER',
+    'downloadCount': 'INTEGER',
+    'categories': 'TEXT',
+    'tags': 'TEXT',
+    'pricing': 'TEXT',
+    'hasIcon': 'INTEGER',
+}
+
+PRIMARY_KEY = 'extensionId'
+
+# Column holding a digest of the other columns, used to skip unchanged rows
+HASH_COLUMN = 'content_hash'
+
+# Secondary indexes backing the queries in queries/, created after bulk load
+INDEXED_COLUMNS = ('publisherId', 'publisherDisplayName', 'install', 'publishedDate',
+                   'lastUpdated')
+
+# Columns moved to the publishers table of the normalised schema
+PUBLISHER_COLUMNS = ('publisherId', 'publisherName', 'publisherDisplayName')
+
+# List columns of the normalised schema: column -> (table, key column, link table)
+LIST_COLUMNS = {
+    'categories': ('categories', 'categoryKey', 'extension_categories'),
+    'tags': ('tags', 'tagKey', 'extension_tags'),
+}
+
+# Columns of the full-text index and their bm25 weights
+SEARCH_COLUMNS = {
+    'extensionDisplayName': 10.0,
+    'extensionName': 5.0,
+    'publisherDisplayName': 2.0,
+    'shortDescription': 1.0,
+    'tags': 3.0,
+}
+
+BULK_LOAD_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'OFF',
+    'cache_size': '-262144',
+    'temp_store': 'MEMORY',
+}
+
+INCREMENTAL_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': '-262144',
+}
+
+
+def quote_identifier(name: str) -> str:
+    """Quote a table or column name for use in SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def adapt_value(value: Any) -> Any:
+    """Convert a processed value to a type SQLite can store."""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (list, dict)):
+        return str(value)
+    return value
+
+
+def row_hash(values: Sequence[Any]) -> str:
+    """Digest of a row's adapted values."""
+    return hashlib.blake2b(repr(tuple(values)).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class NormalizedSchema:
+    """
+    Relational copy of the extensions with integer surrogate keys.
+
+    ``publishers`` holds one row per publisher, ``extensions`` one row per
+    extension referencing its publisher, and ``categories``/``tags`` one row
+    per distinct name, linked to extensions through ``extension_categories``
+    and ``extension_tags``. The link tables are keyed by category or tag
+    first, so filtering by a category or tag is an index lookup.
+
+    Surrogate keys are assigned in Python from maps loaded once per export,
+    so rows are written with plain ``executemany`` calls.
+    """
+
+    tables = ('extension_tags', 'extension_categories', 'tags', 'categories', 'extensions',
+              'publishers')
+
+    def __init__(self):
+        self.keys: Dict[str, Dict[Any, int]] = {}
+        self.next_keys: Dict[str, int] = {}
+
+    def exists(self, conn: sqlite3.Connection) -> bool:
+        """Whether all tables of the schema exist."""
+        existing = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        return existing.issuperset(self.tables)
+
+    @staticmethod
+    def _extension_columns(columns: Sequence[str]) -> List[str]:
+        """Columns stored on the extensions table itself."""
+        return [column for column in columns
+                if column not in PUBLISHER_COLUMNS and column not in LIST_COLUMNS]
+
+    def drop(self, conn: sqlite3.Connection) -> None:
+        """Drop the schema's tables."""
+        for table in self.tables:
+            conn.execute(f'DROP TABLE IF EXISTS {quote_identifier(table)}')
+
+    def create(self, conn: sqlite3.Connection, columns: Sequence[str]) -> None:
+        """Drop and recreate the schema's tables."""
+        self.drop(conn)
+
+        publisher_columns = ', '.join(f'{quote_identifier(column)} {COLUMN_TYPES[column]}'
+                                      for column in PUBLISHER_COLUMNS[1:])
+        conn.execute(f'CREATE TABLE publishers (publisherKey INTEGER PRIMARY KEY, '
+                     f'publisherId TEXT NOT NULL UNIQUE, {publisher_columns})')
+
+        extension_columns = ''.join(
+            f', {quote_identifier(column)} {COLUMN_TYPES.get(column, "")}'.rstrip()
+            for column in self._extension_columns(columns) if column != PRIMARY_KEY)
+        conn.execute(f'CREATE TABLE extensions (extensionKey INTEGER PRIMARY KEY, '
+                     f'extensionId TEXT NOT NULL UNIQUE, '
+                     f'publisherKey INTEGER REFERENCES publishers (publisherKey)'
+                     f'{extension_columns})')
+
+        for table, key, link_table in LIST_COLUMNS.values():
+            conn.execute(f'CREATE TABLE {table} ({key} INTEGER PRIMARY KEY, '
+                         f'name TEXT NOT NULL UNIQUE)')
+            conn.execute(f'CREATE TABLE {link_table} ('
+                         f'{key} INTEGER NOT NULL REFERENCES {table} ({key}), '
+                         f'extensionKey INTEGER NOT NULL REFERENCES extensions (extensionKey), '
+                         f'PRIMARY KEY ({key}, extensionKey)) WITHOUT ROWID')
+
+    def create_indexes(self, conn: sqlite3.Connection) -> None:
+        """Create the secondary indexes, once the tables are filled."""
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_extensions_publisherKey '
+                     'ON extensions (publisherKey)')
+        for _, _, link_table in LIST_COLUMNS.values():
+            conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{link_table}_extensionKey '
+                         f'ON {link_table} (extensionKey)')
+
+    def load_keys(self, conn: sqlite3.Connection) -> None:
+        """Load the surrogate keys already assigned in the database."""
+        natural_keys = {
+            'publishers': ('publisherId', 'publisherKey'),
+            'extensions': ('extensionId', 'extensionKey'),
+            **{table: ('name', key) for table, key, _ in LIST_COLUMNS.values()},
+        }
+        for table, (name, key) in natural_keys.items():
+            self.keys[table] = dict(conn.execute(f'SELECT {name}, {key} FROM {table}'))
+            self.next_keys[table] = max(self.keys[table].values(), default=0) + 1
+
+    def _key(self, table: str, value: Any) -> Tuple[int, bool]:
+        """Surrogate key of a natural key, and whether it was newly assigned."""
+        keys = self.keys[table]
+        key = keys.get(value)
+        if key is not None:
+            return key, False
+        key = keys[value] = self.next_keys[table]
+        self.next_keys[table] += 1
+        return key, True
+
+    def write(self, conn: sqlite3.Connection, columns: Sequence[str],
+              rows: List[List[Any]], replace_links: bool = False) -> None:
+        """
+        Write a batch of processed rows to the schema.
+
+        Args:
+            conn: Connection with an open transaction
+            columns: Column names of ``rows``
+            rows: Processed extension rows
+            replace_links: Remove the existing category and tag links of the
+                extensions first, for rows that may already be stored
+        """
+        positions = {column: position for position, column in enumerate(columns)}
+        extension_columns = self._extension_columns(columns)
+        publishers = {}
+        extensions = []
+        new_names = {column: [] for column in LIST_COLUMNS}
+        links = {column: [] for column in LIST_COLUMNS}
+
+        for row in rows:
+            publisher_key = None
+            publisher_id = row[positions['publisherId']] if 'publisherId' in positions else None
+            if publisher_id is not None:
+                publisher_key, _ = self._key('publishers', publisher_id)
+                publishers[publisher_key] = [publisher_key] + [
+                    adapt_value(row[positions[column]]) if column in positions else None
+                    for column in PUBLISHER_COLUMNS]
+
+            extension_key, _ = self._key('extensions', row[positions[PRIMARY_KEY]])
+            extensions.append([extension_key, publisher_key] + [
+                adapt_value(row[positions[column]]) for column in extension_columns])
+
+            for column, (table, _, _) in LIST_COLUMNS.items():
+                names = row[positions[column]] if column in positions else None
+                if names is None:
+                    continue
+                for name in dict.fromkeys(names if isinstance(names, list) else [names]):
+                    key, is_new = self._key(table, name)
+                    if is_new:
+                        new_names[column].append((key, name))
+                    links[column].append((key, extension_key))
+
+        names = ', '.join(quote_identifier(column) for column in PUBLISHER_COLUMNS)
+        updates = ', '.join(f'{quote_identifier(column)} = excluded.{quote_identifier(column)}'
+                            for column in PUBLISHER_COLUMNS[1:])
+        conn.executemany(f'INSERT INTO publishers (publisherKey, {names}) VALUES (?, ?, ?, ?) '
+                         f'ON CONFLICT (publisherKey) DO UPDATE SET {updates}',
+                         publishers.values())
+
+        names = ', '.join(quote_identifier(column) for column in extension_columns)
+        placeholders = ', '.join('?' for _ in extension_columns)
+        conn.executemany(f'INSERT OR REPLACE INTO extensions (extensionKey, publisherKey, {names}) '
+                         f'VALUES (?, ?, {placeholders})', extensions)
+
+        for column, (table, key, link_table) in LIST_COLUMNS.items():
+            conn.executemany(f'INSERT INTO {table} ({key}, name) VALUES (?, ?)',
+                             new_names[column])
+            if replace_links:
+                conn.executemany(f'DELETE FROM {link_table} WHERE extensionKey = ?',
+                                 ((extension[0],) for extension in extensions))
+            conn.executemany(f'INSERT OR IGNORE INTO {link_table} ({key}, extensionKey) '
+                             f'VALUES (?, ?)', links[column])
+
+
+class SearchIndex:
+    """
+    FTS5 full-text index over the extensions table.
+
+    The index is an external-content FTS5 table (``<table_name>_fts``) that
+    stores only the inverted index and reads column values from the
+    extensions table. It is built in one go after a full load and kept in
+    sync by triggers afterwards, so upserts update it incrementally.
+    """
+
+    # Suffixes of the triggers keeping the index in sync
+    triggers = ('ai', 'ad', 'au')
+
+    def __init__(self, table_name: str = 'vscode_extensions'):
+        self.table_name = table_name
+        self.index_name = f'{table_name}_fts'
+
+    def exists(self, conn: sqlite3.Connection) -> bool:
+        """Whether the index table and all its triggers exist."""
+        existing = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")}
+        return {self.index_name,
+                *(f'{self.index_name}_{suffix}' for suffix in self.triggers)} <= existing
+
+    @staticmethod
+    def _columns(columns: Sequence[str]) -> List[str]:
+        return [column for column in SEARCH_COLUMNS if column in columns]
+
+    def drop(self, conn: sqlite3.Connection) -> None:
+        """Drop the index table."""
+        conn.execute(f'DROP TABLE IF EXISTS {quote_identifier(self.index_name)}')
+
+    def create(self, conn: sqlite3.Connection, columns: Sequence[str]) -> None:
+        """Build the index from the filled extensions table and add its triggers."""
+        index = quote_identifier(self.index_name)
+        table = quote_identifier(self.table_name)
+        names = [quote_identifier(column) for column in self._columns(columns)]
+        conn.execute(f'CREATE VIRTUAL TABLE {index} USING fts5({", ".join(names)}, '
+                     f"content={table}, content_rowid='rowid', prefix='2 3')")
+        conn.execute(f"INSERT INTO {index} ({index}) VALUES ('rebuild')")
+
+        new_values = ', '.join(f'new.{name}' for name in names)
+        old_values = ', '.join(f'old.{name}' for name in names)
+        insert = (f'INSERT INTO {index} (rowid, {", ".join(names)}) '
+                  f'VALUES (new.rowid, {new_values});')
+        delete = (f'INSERT INTO {index} ({index}, rowid, {", ".join(names)}) '
+                  f"VALUES ('delete', old.rowid, {old_values});")
+        # Upserts set every column, so the update trigger compares the
+        # indexed values; updates leaving them unchanged leave the index alone
+        changed = ' OR '.join(f'old.{name} IS NOT new.{name}' for name in names)
+        triggers = {
+            'ai': (f'AFTER INSERT ON {table}', insert),
+            'ad': (f'AFTER DELETE ON {table}', delete),
+            'au': (f'AFTER UPDATE OF {", ".join(names)} ON {table} WHEN {changed}',
+                   delete + ' ' + insert),
+        }
+        for suffix, (event, body) in triggers.items():
+            conn.execute(f'CREATE TRIGGER {quote_identifier(f"{self.index_name}_{suffix}")} '
+                         f'{event} BEGIN {body} END')
+
+    def search(self, conn: sqlite3.Connection, query: str,
+               limit: int = 20) -> List[Tuple[str, str, str, float]]:
+        """
+        Search the index with an FTS5 query, best matches first.
+
+        Matches are ranked with bm25, weighting display and extension names
+        above tags, publisher names and descriptions.
+
+        Returns:
+            List of ``(extensionId, extensionDisplayName, publisherDisplayName,
+            score)`` tuples; lower scores are better
+        """
+        index = quote_identifier(self.index_name)
+        columns = self._columns([row[1] for row in
+                                 conn.execute(f'PRAGMA table_info({index})')])
+        weights = ', '.join(str(SEARCH_COLUMNS[column]) for column in columns)
+        return conn.execute(
+            f'SELECT e.extensionId, e.extensionDisplayName, e.publisherDisplayName, '
+            f'bm25({index}, {weights}) AS score '
+            f'FROM {index} JOIN {quote_identifier(self.table_name)} AS e '
+            f'ON e.rowid = {index}.rowid '
+            f'WHERE {index} MATCH ? ORDER BY score LIMIT ?', (query, limit)).fetchall()
+
+
+class PublisherSummary:
+    """
+    Publisher rollups maintained alongside the extensions table.
+
+    ``publisher_summary`` holds one row per publisher (extension count,
+    total downloads, first and last update) and
+    ``publisher_extension_histogram`` the number of publishers per extension
+    count. Both are rebuilt with a single ``GROUP BY`` after a full load and
+    then kept up to date by triggers: a changed row only recomputes the
+    summary of its publisher, through the ``publisherId`` index, and moves
+    that publisher between two histogram buckets.
+    """
+
+    summary_table = 'publisher_summary'
+    histogram_table = 'publisher_extension_histogram'
+
+    # Columns whose changes affect the rollups
+    columns = ('publisherId', 'publisherDisplayName', 'downloadCount', 'lastUpdated')
+
+    # Suffixes of the triggers keeping the rollups up to date
+    triggers = ('ai', 'ad', 'au', 'au_moved')
+
+    def __init__(self, table_name: str = 'vscode_extensions'):
+        self.table_name = table_name
+
+    def exists(self, conn: sqlite3.Connection) -> bool:
+        """Whether both rollup tables and all their triggers exist."""
+        existing = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")}
+        return {self.summary_table, self.histogram_table,
+                *(f'{self.summary_table}_{suffix}' for suffix in self.triggers)} <= existing
+
+    def _summary_select(self, condition: str) -> str:
+        return (f'SELECT publisherId, max(publisherDisplayName), count(*), sum(downloadCount), '
+                f'min(lastUpdated), max(lastUpdated) '
+                f'FROM {quote_identifier(self.table_name)} WHERE {condition} '
+                f'GROUP BY publisherId')
+
+    def _refresh_sql(self, publisher_id: str) -> str:
+        """Trigger statements recomputing the rollups of one publisher."""
+        summary = self.summary_table
+        histogram = self.histogram_table
+        return (
+            f'UPDATE {histogram} SET publisherCount = publisherCount - 1 '
+            f'WHERE extensionCount = (SELECT extensionCount FROM {summary} '
+            f'WHERE publisherId = {publisher_id}); '
+            f'DELETE FROM {summary} WHERE publisherId = {publisher_id}; '
+            f'INSERT INTO {summary} {self._summary_select(f"publisherId = {publisher_id}")}; '
+            f'INSERT INTO {histogram} (extensionCount, publisherCount) '
+            f'SELECT extensionCount, 1 FROM {summary} WHERE publisherId = {publisher_id} '
+            f'ON CONFLICT (extensionCount) DO UPDATE SET publisherCount = publisherCount + 1; '
+            f'DELETE FROM {histogram} WHERE publisherCount = 0;')
+
+    def drop(self, conn: sqlite3.Connection) -> None:
+        """Drop both rollup tables."""
+        conn.execute(f'DROP TABLE IF EXISTS {self.summary_table}')
+        conn.execute(f'DROP TABLE IF EXISTS {self.histogram_table}')
+
+    def create(self, conn: sqlite3.Connection) -> None:
+        """Rebuild both tables from the extensions table and add the triggers."""
+        table = quote_identifier(self.table_name)
+        self.drop(conn)
+        conn.execute(f'CREATE TABLE {self.summary_table} (publisherId TEXT PRIMARY KEY, '
+                     f'publisherDisplayName TEXT, extensionCount INTEGER NOT NULL, '
+                     f'totalDownloadCount INTEGER, firstUpdated TEXT, lastUpdated TEXT)')
+        conn.execute(f'CREATE TABLE {self.histogram_table} ('
+                     f'extensionCount INTEGER PRIMARY KEY, publisherCount INTEGER NOT NULL)')
+        conn.execute(f'INSERT INTO {self.summary_table} '
+                     f'{self._summary_select("publisherId IS NOT NULL")}')
+        conn.execute(f'INSERT INTO {self.histogram_table} '
+                     f'SELECT extensionCount, count(*) FROM {self.summary_table} '
+                     f'GROUP BY extensionCount')
+
+        # Upserts set every column, so the update triggers compare the rollup
+        # columns; a row moved to another publisher also refreshes the new one
+        update = f'AFTER UPDATE OF {", ".join(self.columns)} ON {table}'
+        changed = ' OR '.join(f'old.{column} IS NOT new.{column}' for column in self.columns)
+        triggers = {
+            'ai': (f'AFTER INSERT ON {table}', self._refresh_sql('new.publisherId')),
+            'ad': (f'AFTER DELETE ON {table}', self._refresh_sql('old.publisherId')),
+            'au': (f'{update} WHEN {changed}', self._refresh_sql('old.publisherId')),
+            'au_moved': (f'{update} WHEN old.publisherId IS NOT new.publisherId',
+                         self._refresh_sql('new.publisherId')),
+        }
+        for suffix, (event, body) in triggers.items():
+            conn.execute(f'CREATE TRIGGER {quote_identifier(f"{self.summary_table}_{suffix}")} '
+                         f'{event} BEGIN {body} END')
+
+
+class SQLiteExporter:
+    """Stream processed extension rows into a SQLite table."""
+
+    def __init__(self, db_file: str = 'vscode_extensions.db',
+                 table_name: str = 'vscode_extensions', batch_size: int = 10000,
+                 normalize: bool = False, search_index: bool = False,
+                 publisher_summary: bool = False):
+        self.db_file = db_file
+        self.table_name = table_name
+        self.batch_size = batch_size
+        self.normalized = NormalizedSchema() if normalize else None
+        self.search_index = SearchIndex(table_name) if search_index else None
+        self.publisher_summary = PublisherSummary(table_name) if publisher_summary else None
+
+    def connect(self, pragmas: Dict[str, str] = None) -> sqlite3.Connection:
+        """Open the database in autocommit mode with the given pragmas applied."""
+        conn = sqlite3.connect(self.db_file, isolation_level=None)
+        for pragma, value in (pragmas or {}).items():
+            conn.execute(f'PRAGMA {pragma} = {value}')
+        return conn
+
+    def _table_columns(self, conn: sqlite3.Connection) -> List[str]:
+        """Columns of the existing table, empty if it does not exist."""
+        return [row[1] for row in
+                conn.execute(f'PRAGMA table_info({quote_identifier(self.table_name)})')]
+
+    def _column_definition(self, column: str) -> str:
+        definition = f'{quote_identifier(column)} {COLUMN_TYPES.get(column, "")}'.strip()
+        if column == PRIMARY_KEY:
+            definition += ' PRIMARY KEY'
+        return definition
+
+    def _create_table_sql(self, columns: Sequence[str]) -> str:
+        definitions = ', '.join(self._column_definition(column) for column in columns)
+        return f'CREATE TABLE {quote_identifier(self.table_name)} ({definitions})'
+
+    def _insert_sql(self, columns: Sequence[str]) -> str:
+        names = ', '.join(quote_identifier(column) for column in columns)
+        placeholders = ', '.join('?' for _ in columns)
+        return (f'INSERT OR REPLACE INTO {quote_identifier(self.table_name)} ({names}) '
+                f'VALUES ({placeholders})')
+
+    def _upsert_sql(self, columns: Sequence[str]) -> str:
+        """Insert new rows and update existing ones only when their hash changed."""
+        table = quote_identifier(self.table_name)
+        names = ', '.join(quote_identifier(column) for column in columns)
+        placeholders = ', '.join('?' for _ in columns)
+        updates = ', '.join(f'{quote_identifier(column)} = excluded.{quote_identifier(column)}'
+                            for column in columns if column != PRIMARY_KEY)
+        return (f'INSERT INTO {table} ({names}) VALUES ({placeholders}) '
+                f'ON CONFLICT({quote_identifier(PRIMARY_KEY)}) DO UPDATE SET {updates} '
+                f'WHERE {table}.{quote_identifier(HASH_COLUMN)} '
+                f'IS NOT excluded.{quote_identifier(HASH_COLUMN)}')
+
+    def _create_indexes(self, conn: sqlite3.Connection, columns: Sequence[str]) -> None:
+        """Create the secondary indexes for the columns present in the table."""
+        for column in INDEXED_COLUMNS:
+            if column in columns:
+                index_name = quote_identifier(f'idx_{self.table_name}_{column}')
+                conn.execute(f'CREATE INDEX IF NOT EXISTS {index_name} '
+                             f'ON {quote_identifier(self.table_name)} ({quote_identifier(column)})')
+
+    def _insert_rows(self, conn: sqlite3.Connection, sql: str, columns: Sequence[str],
+                     rows: Iterable[List[Any]],
+                     stored_hashes: Optional[Dict[str, str]] = None) -> Tuple[int, int]:
+        """
+        Insert rows in batches of ``batch_size``.
+
+        When ``stored_hashes`` maps extension ids to their stored content
+        hash, rows whose hash is unchanged are skipped.
+
+        Returns:
+            Number of rows processed and number of rows written
+        """
+        total_rows = written_rows = 0
+        key_position = list(columns).index(PRIMARY_KEY)
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.batch_size))
+            if not chunk:
+                return total_rows, written_rows
+            total_rows += len(chunk)
+            batch = []
+            changed = []
+            for row in chunk:
+                values = [adapt_value(value) for value in row]
+                values.append(row_hash(values))
+                if (stored_hashes is not None
+                        and stored_hashes.get(values[key_position]) == values[-1]):
+                    continue
+                batch.append(values)
+                changed.append(row)
+            if not batch:
+                continue
+            conn.executemany(sql, batch)
+            if self.normalized is not None:
+                self.normalized.write(conn, columns, changed,
+                                      replace_links=stored_hashes is not None)
+            written_rows += len(batch)
+
+    def load(self, columns: Sequence[str], rows: Iterable[List[Any]]) -> int:
+        """
+        Replace the table with ``rows``.
+
+        The table is dropped, recreated with explicit column types and a
+        primary key on ``extensionId`` and filled in one transaction, so
+        readers keep seeing the previous table until the load commits.
+        Secondary indexes are built once the rows are in, followed by
+        ``ANALYZE`` so the query planner has statistics to choose them.
+        The normalised schema, if enabled, is rebuilt in the same pass, and
+        the full-text index and publisher rollups, if enabled, are rebuilt
+        from the loaded table. A normalised schema, full-text index or
+        publisher rollups left by an earlier load are dropped when disabled,
+        so they never go stale and a later ``upsert`` enabling them falls
+        back to a full load.
+
+        Returns:
+            Number of rows loaded
+        """
+        columns = list(columns)
+        with closing(self.connect(BULK_LOAD_PRAGMAS)) as conn:
+            conn.execute('BEGIN')
+            try:
+                (self.search_index or SearchIndex(self.table_name)).drop(conn)
+                if self.normalized is None:
+                    NormalizedSchema().drop(conn)
+                if self.publisher_summary is None:
+                    PublisherSummary(self.table_name).drop(conn)
+                conn.execute(f'DROP TABLE IF EXISTS {quote_identifier(self.table_name)}')
+                conn.execute(self._create_table_sql([*columns, HASH_COLUMN]))
+                if self.normalized is not None:
+                    self.normalized.create(conn, columns)
+                    self.normalized.load_keys(conn)
+                total_rows, _ = self._insert_rows(
+                    conn, self._insert_sql([*columns, HASH_COLUMN]), columns, rows)
+                self._create_indexes(conn, columns)
+                if self.normalized is not None:
+                    self.normalized.create_indexes(conn)
+                if self.search_index is not None:
+                    self.search_index.create(conn, columns)
+                if self.publisher_summary is not None:
+                    self.publisher_summary.create(conn)
+                conn.execute('ANALYZE')
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        return total_rows
+
+    def upsert(self, columns: Sequence[str], rows: Iterable[List[Any]]) -> Tuple[int, int]:
+        """
+        Merge ``rows`` into the existing table by ``extensionId``.
+
+        New extensions are inserted and existing ones are rewritten only when
+        their content hash differs, all in one transaction; only those rows
+        are written to the normalised schema, if enabled, and triggers update
+        the full-text index and publisher rollups, if enabled, for them.
+        Extensions missing from ``rows`` are kept. Falls back to a full
+        ``load`` when the tables do not exist yet or have different columns.
+        A normalised schema left by an earlier export is dropped when
+        disabled, since nothing else would keep it in sync with the table.
+
+        Returns:
+            Number of rows processed and number of rows inserted or updated
+        """
+        columns = list(columns)
+        with closing(self.connect()) as conn:
+            up_to_date = (self._table_columns(conn) == [*columns, HASH_COLUMN]
+                          and (self.normalized is None or self.normalized.exists(conn))
+                          and (self.search_index is None or self.search_index.exists(conn))
+                          and (self.publisher_summary is None
+                               or self.publisher_summary.exists(conn)))
+        if not up_to_date:
+            logger.info(f"Table {self.table_name} is missing or outdated, running a full load")
+            total_rows = self.load(columns, rows)
+            return total_rows, total_rows
+
+        with closing(self.connect(INCREMENTAL_PRAGMAS)) as conn:
+            conn.execute('BEGIN')
+            try:
+                if self.normalized is None:
+                    NormalizedSchema().drop(conn)
+                stored_hashes = dict(conn.execute(
+                    f'SELECT {quote_identifier(PRIMARY_KEY)}, {quote_identifier(HASH_COLUMN)} '
+                    f'FROM {quote_identifier(self.table_name)}'))
+                if self.normalized is not None:
+                    self.normalized.load_keys(conn)
+                total_rows, changed_rows = self._insert_rows(
+                    conn, self._upsert_sql([*columns, HASH_COLUMN]), columns, rows,
+                    stored_hashes)
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('PRAGMA optimize')
+        return total_rows, changed_rows
+
+
+def explain_query_plan(conn: sqlite3.Connection, sql: str) -> List[str]:
+    """Return the ``EXPLAIN QUERY PLAN`` details of a query."""
+    return [row[-1] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}')]
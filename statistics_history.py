@@ -0,0 +1,195 @@
+# statistics_history.py
+"""
+Statistics History
+
+This module keeps a time series of extension statistics across crawls in
+SQLite. Each snapshot is delta encoded: a history row is only written for
+extensions whose statistics changed since the previous snapshot, and within
+it every unchanged statistic is stored as NULL. A bitmask of the changed
+statistics tells an unchanged statistic from one whose value was removed.
+"""
+
+import logging
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from sqlite_exporter import (COLUMN_TYPES, INCREMENTAL_PRAGMAS, PRIMARY_KEY, adapt_value,
+                             quote_identifier)
+
+logger = logging.getLogger(__name__)
+
+# Statistics tracked over time, in column order
+STATISTIC_COLUMNS = ('install', 'averagerating', 'ratingcount', 'trendingdaily',
+                     'trendingmonthly', 'trendingweekly', 'weightedRating', 'updateCount',
+                     'downloadCount')
+
+TIMESTAMP_COLUMN = 'crawledAt'
+
+# Bitmask of the statistics changed in a history row, bit i for STATISTIC_COLUMNS[i]
+CHANGED_COLUMN = 'changedStatistics'
+
+
+class StatisticsHistory:
+    """
+    Delta-encoded statistics snapshots stored in SQLite.
+
+    ``<table_name>`` holds one row per extension and crawl in which any
+    statistic changed, with NULL for the statistics that did not and a
+    ``changedStatistics`` bitmask of those that did; a changed statistic
+    stored as NULL was removed. ``<table_name>_latest`` holds the current
+    value of every statistic and is what new snapshots are compared against.
+    """
+
+    def __init__(self, db_file: str = 'vscode_extensions.db',
+                 table_name: str = 'extension_statistics', batch_size: int = 10000):
+        self.db_file = db_file
+        self.table_name = table_name
+        self.latest_table = f'{table_name}_latest'
+        self.batch_size = batch_size
+
+    def connect(self) -> sqlite3.Connection:
+        """Open the database in autocommit mode."""
+        conn = sqlite3.connect(self.db_file, isolation_level=None)
+        for pragma, value in INCREMENTAL_PRAGMAS.items():
+            conn.execute(f'PRAGMA {pragma} = {value}')
+        return conn
+
+    def _create_tables(self, conn: sqlite3.Connection) -> None:
+        key = quote_identifier(PRIMARY_KEY)
+        timestamp = quote_identifier(TIMESTAMP_COLUMN)
+        statistics = ', '.join(f'{quote_identifier(column)} {COLUMN_TYPES[column]}'
+                               for column in STATISTIC_COLUMNS)
+        changed = quote_identifier(CHANGED_COLUMN)
+        history = quote_identifier(self.table_name)
+        conn.execute(f'CREATE TABLE IF NOT EXISTS {history} ('
+                     f'{key} TEXT NOT NULL, {timestamp} TEXT NOT NULL, {statistics}, '
+                     f'{changed} INTEGER NOT NULL DEFAULT 0, '
+                     f'PRIMARY KEY ({key}, {timestamp})) WITHOUT ROWID')
+        if CHANGED_COLUMN not in {row[1] for row in conn.execute(f'PRAGMA table_info({history})')}:
+            # Histories written before the bitmask only recorded non-NULL changes
+            conn.execute(f'ALTER TABLE {history} ADD COLUMN {changed} INTEGER NOT NULL DEFAULT 0')
+            conn.execute(f'UPDATE {history} SET {changed} = ' + ' | '.join(
+                f'(({quote_identifier(column)} IS NOT NULL) << {bit})'
+                for bit, column in enumerate(STATISTIC_COLUMNS)))
+        # The primary key serves per-extension scans; this one serves time ranges
+        conn.execute(f'CREATE INDEX IF NOT EXISTS '
+                     f'{quote_identifier(f"idx_{self.table_name}_{TIMESTAMP_COLUMN}")} '
+                     f'ON {history} ({timestamp})')
+        conn.execute(f'CREATE TABLE IF NOT EXISTS {quote_identifier(self.latest_table)} ('
+                     f'{key} TEXT PRIMARY KEY, {statistics}) WITHOUT ROWID')
+        conn.execute(f'CREATE TEMP TABLE IF NOT EXISTS snapshot ('
+                     f'{key} TEXT PRIMARY KEY, {statistics}) WITHOUT ROWID')
+
+    def _apply_snapshot_sql(self, crawled_at: str,
+                            statistics: Sequence[str]) -> List[Tuple[str, Tuple[Any, ...]]]:
+        """
+        Statements moving the staged snapshot into the history and latest tables.
+
+        Only ``statistics`` are compared and updated; the others keep their
+        latest values instead of being recorded as removed.
+        """
+        key = quote_identifier(PRIMARY_KEY)
+        history = quote_identifier(self.table_name)
+        latest = quote_identifier(self.latest_table)
+        columns = [quote_identifier(column) for column in statistics]
+        bits = [1 << STATISTIC_COLUMNS.index(column) for column in statistics]
+        mask = quote_identifier(CHANGED_COLUMN)
+        deltas = ', '.join(f'CASE WHEN latest.{column} IS s.{column} THEN NULL '
+                           f'ELSE s.{column} END' for column in columns)
+        changed_bits = ' | '.join(f'((latest.{column} IS NOT s.{column}) * {bit})'
+                                  for bit, column in zip(bits, columns))
+        changed = ' OR '.join(f'latest.{column} IS NOT s.{column}' for column in columns)
+        names = ', '.join(columns)
+        return [
+            (f'INSERT INTO {history} ({key}, {quote_identifier(TIMESTAMP_COLUMN)}, {names}, '
+             f'{mask}) SELECT s.{key}, ?, {deltas}, {changed_bits} FROM snapshot AS s '
+             f'LEFT JOIN {latest} AS latest ON latest.{key} = s.{key} '
+             f'WHERE latest.{key} IS NULL OR {changed} '
+             f'ON CONFLICT ({key}, {quote_identifier(TIMESTAMP_COLUMN)}) DO UPDATE SET '
+             + ', '.join(f'{column} = CASE WHEN excluded.{mask} & {bit} '
+                         f'THEN excluded.{column} ELSE {column} END'
+                         for bit, column in zip(bits, columns))
+             + f', {mask} = {mask} | excluded.{mask}', (crawled_at,)),
+            (f'INSERT INTO {latest} ({key}, {names}) SELECT {key}, {names} FROM snapshot '
+             f'WHERE true ON CONFLICT ({key}) DO UPDATE SET '
+             + ', '.join(f'{column} = excluded.{column}' for column in columns), ()),
+            ('DELETE FROM snapshot', ()),
+        ]
+
+    def record(self, columns: Sequence[str], rows: Iterable[List[Any]],
+               crawled_at: Optional[str] = None) -> int:
+        """
+        Append a snapshot of the statistics in ``rows``.
+
+        Rows are staged in batches and compared with the latest recorded
+        values in SQL, all in one transaction.
+
+        Args:
+            columns: Column names of ``rows``; must include ``extensionId``
+            rows: Processed extension rows; statistics missing from
+                ``columns`` keep their latest recorded values
+            crawled_at: Timestamp of the snapshot, defaults to the current UTC time
+
+        Returns:
+            Number of extensions whose statistics changed
+
+        Raises:
+            ValueError: If ``columns`` holds none of the tracked statistics
+        """
+        statistics = [column for column in STATISTIC_COLUMNS if column in columns]
+        if not statistics:
+            raise ValueError("Rows hold none of the tracked statistics")
+        crawled_at = crawled_at or datetime.now(timezone.utc).isoformat(timespec='seconds')
+        positions = [list(columns).index(column) if column in columns else None
+                     for column in (PRIMARY_KEY, *STATISTIC_COLUMNS)]
+        placeholders = ', '.join('?' for _ in positions)
+        statements = self._apply_snapshot_sql(crawled_at, statistics)
+
+        with closing(self.connect()) as conn:
+            conn.execute('BEGIN')
+            try:
+                self._create_tables(conn)
+                changed_rows = 0
+                rows = iter(rows)
+                while True:
+                    batch = [[adapt_value(row[position]) if position is not None else None
+                              for position in positions]
+                             for row in islice(rows, self.batch_size)]
+                    if not batch:
+                        break
+                    conn.executemany(f'INSERT OR REPLACE INTO snapshot VALUES ({placeholders})',
+                                     batch)
+                    history_sql, parameters = statements[0]
+                    changes_before = conn.total_changes
+                    conn.execute(history_sql, parameters)
+                    changed_rows += conn.total_changes - changes_before
+                    for sql, parameters in statements[1:]:
+                        conn.execute(sql, parameters)
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        return changed_rows
+
+    def series(self, extension_id: str, statistic: str) -> List[Tuple[str, Any]]:
+        """
+        Values of a statistic for one extension at each crawl where it changed.
+
+        Returns:
+            List of ``(crawledAt, value)`` pairs in chronological order; the
+            value is None where the statistic was removed
+        """
+        if statistic not in STATISTIC_COLUMNS:
+            raise ValueError(f"Unknown statistic {statistic!r}")
+        column = quote_identifier(statistic)
+        bit = 1 << STATISTIC_COLUMNS.index(statistic)
+        with closing(self.connect()) as conn:
+            return conn.execute(
+                f'SELECT {quote_identifier(TIMESTAMP_COLUMN)}, {column} '
+                f'FROM {quote_identifier(self.table_name)} '
+                f'WHERE {quote_identifier(PRIMARY_KEY)} = ? '
+                f'AND {quote_identifier(CHANGED_COLUMN)} & {bit} '
+                f'ORDER BY {quote_identifier(TIMESTAMP_COLUMN)}', (extension_id,)).fetchall()
@@ -0,0 +1,7 @@
+# tests/conftest.py
+"""Shared fixtures: make the top-level modules importable from the tests."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
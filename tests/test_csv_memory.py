@@ -0,0 +1,34 @@
+# tests/test_csv_memory.py
+"""Peak memory of the streaming CSV export as the catalog grows."""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.fixtures import write_pages
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Allowed peak RSS growth for a 10x larger catalog; a pipeline holding
+# every row in memory grows far beyond this
+MAX_PEAK_RATIO = 1.25
+
+
+def peak_rss(directory):
+    """Peak RSS in KiB of convert_to_csv over ``directory``, in a fresh interpreter."""
+    result = subprocess.run([sys.executable, '-m', 'benchmarks.csv_memory_benchmark',
+                             '--measure', str(directory)],
+                            cwd=directory, env={**os.environ, 'PYTHONPATH': str(REPO_ROOT)},
+                            capture_output=True, text=True, check=True)
+    return float(re.search(r'peak_rss=([\d.]+) MiB', result.stdout).group(1)) * 1024
+
+
+def test_peak_rss_stays_flat_over_10x_catalog(tmp_path):
+    small, large = tmp_path / 'small', tmp_path / 'large'
+    small.mkdir()
+    large.mkdir()
+    write_pages(str(small), 2000)
+    write_pages(str(large), 20000)
+    assert peak_rss(large) / peak_rss(small) < MAX_PEAK_RATIO
@@ -0,0 +1,41 @@
+# tests/test_parquet_export.py
+"""Parquet export with one publication year per row group."""
+
+import pytest
+
+pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+
+from parquet_exporter import ParquetExporter  # noqa: E402
+
+COLUMNS = ['extensionId', 'publishedDate', 'install']
+
+
+def interleaved_rows(count, years):
+    return [[f'ext-{index}', f'{2010 + index % years}-06-01', index] for index in range(count)]
+
+
+def row_group_years(output_file):
+    metadata = pyarrow_parquet.ParquetFile(output_file).metadata
+    column = COLUMNS.index('publishedDate')
+    for group in range(metadata.num_row_groups):
+        statistics = metadata.row_group(group).column(column).statistics
+        yield statistics.min.year, statistics.max.year, metadata.row_group(group).num_rows
+
+
+def test_buffered_rows_are_capped_across_years(tmp_path):
+    output_file = str(tmp_path / 'extensions.parquet')
+    exporter = ParquetExporter(output_file, row_group_size=1000, max_buffered_rows=20)
+    assert exporter.write(COLUMNS, interleaved_rows(200, years=10)) == 200
+
+    groups = list(row_group_years(output_file))
+    assert all(first == last for first, last, _ in groups)
+    assert sum(rows for _, _, rows in groups) == 200
+    # Without the cap every year would be buffered whole, one group per year
+    assert len(groups) > 10
+    assert max(rows for _, _, rows in groups) < 20
+
+
+def test_full_buffers_are_written_at_row_group_size(tmp_path):
+    output_file = str(tmp_path / 'extensions.parquet')
+    ParquetExporter(output_file, row_group_size=10).write(COLUMNS, interleaved_rows(60, years=2))
+    assert [rows for _, _, rows in row_group_years(output_file)] == [10] * 6
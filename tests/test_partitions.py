@@ -0,0 +1,31 @@
+# tests/test_partitions.py
+"""Category-partitioned crawls against the stub server."""
+
+from benchmarks.fixtures import make_extension
+from benchmarks.stub_server import start_stub_server
+from marketplace_crawler import MarketplaceConfig, MarketplaceCrawler
+from page_storage import PageStore, get_format, list_pages, page_name
+
+
+def test_stale_partition_pages_are_deleted(tmp_path):
+    directory = tmp_path / 'extensions'
+    directory.mkdir()
+    delisted = [make_extension(99999)]
+    PageStore(directory, get_format('json')).save('themes-9', delisted)
+    PageStore(directory, get_format('ndjson.gz')).save('themes-1', delisted)
+    PageStore(directory, get_format('json')).save('snippets-1', delisted)
+
+    server, url = start_stub_server(latency=0, total_extensions=3000)
+    crawler = MarketplaceCrawler(MarketplaceConfig(
+        url=url, output_dir=str(directory), state_file=str(tmp_path / 'state.json'),
+        checkpoint_file=str(tmp_path / 'checkpoint.json')))
+    try:
+        crawled = crawler.crawl_partitioned(categories=['Themes'])
+        crawler.close()
+    finally:
+        server.shutdown()
+
+    pages = sorted(page_name(path) for path in list_pages(directory))
+    assert pages == ['snippets-1', 'themes-1', 'themes-2']
+    saved = PageStore(directory, get_format('json'))
+    assert len(saved.load('themes-1')) + len(saved.load('themes-2')) == crawled
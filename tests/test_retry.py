@@ -0,0 +1,111 @@
+# tests/test_retry.py
+"""Retry handling of MarketplaceCrawler against the fault-injecting stub server."""
+
+import json
+
+import pytest
+
+import marketplace_crawler
+from benchmarks.stub_server import start_stub_server
+from marketplace_crawler import MarketplaceConfig, MarketplaceCrawler, PageFetchError, RetryPolicy
+
+# Retry immediately unless the server sends Retry-After
+FAST_RETRY = RetryPolicy(max_attempts=3, backoff_factor=0.0, jitter=False)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record retry delays instead of sleeping."""
+    delays = []
+    monkeypatch.setattr(marketplace_crawler.time, 'sleep', delays.append)
+    return delays
+
+
+def make_crawler(tmp_path, url, retry=FAST_RETRY):
+    return MarketplaceCrawler(MarketplaceConfig(
+        url=url, output_dir=str(tmp_path / 'extensions'), retry=retry,
+        state_file=str(tmp_path / 'state.json'),
+        checkpoint_file=str(tmp_path / 'checkpoint.json')))
+
+
+def stub(**kwargs):
+    server, url = start_stub_server(latency=0, total_extensions=1500, **kwargs)
+    return server, url
+
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_retriable_status_then_success(tmp_path, sleeps, status):
+    server, url = stub(fault_rate=1.0, fault_status=status, max_faults=2)
+    try:
+        crawler = make_crawler(tmp_path, url)
+        extensions = crawler._make_request(1)
+        crawler.close()
+    finally:
+        server.shutdown()
+    assert len(extensions) == 1000
+    assert server.faults_injected == 2
+    assert len(sleeps) == 2
+
+
+@pytest.mark.parametrize('stream_json', [True, False])
+def test_truncated_body_is_retried(tmp_path, sleeps, stream_json):
+    server, url = stub(fault_rate=1.0, fault_status=200, max_faults=1)
+    try:
+        crawler = make_crawler(tmp_path, url)
+        crawler.config.stream_json = stream_json
+        extensions = crawler._make_request(1)
+        crawler.close()
+    finally:
+        server.shutdown()
+    assert len(extensions) == 1000
+    assert server.faults_injected == 1
+    assert len(sleeps) == 1
+
+
+def test_retry_after_is_honoured(tmp_path, sleeps):
+    server, url = stub(fault_rate=1.0, fault_status=429, retry_after=7, max_faults=1)
+    try:
+        crawler = make_crawler(tmp_path, url)
+        crawler._make_request(1)
+        crawler.close()
+    finally:
+        server.shutdown()
+    assert sleeps == [7.0]
+
+
+def test_fatal_status_is_not_retried(tmp_path, sleeps):
+    server, url = stub(fault_rate=1.0, fault_status=400)
+    try:
+        crawler = make_crawler(tmp_path, url)
+        with pytest.raises(PageFetchError):
+            crawler._make_request(1)
+        crawler.close()
+    finally:
+        server.shutdown()
+    assert server.faults_injected == 1
+    assert sleeps == []
+
+
+def test_failed_page_is_not_end_of_catalog(tmp_path, sleeps):
+    # Page 1 succeeds, then every attempt at page 2 fails
+    server, url = stub(fault_rate=0.0, fault_status=503)
+    crawler = make_crawler(tmp_path, url)
+    original = crawler._fetch_page
+
+    def fetch_page(page, **filter_overrides):
+        server.fault_rate = 1.0 if page == 2 else 0.0
+        return original(page, **filter_overrides)
+
+    crawler._fetch_page = fetch_page
+    try:
+        with pytest.raises(PageFetchError):
+            crawler.crawl(max_pages=5)
+        crawler.close()
+    finally:
+        server.shutdown()
+
+    checkpoint = json.loads((tmp_path / 'checkpoint.json').read_text())
+    assert checkpoint['lastPage'] == 1
+    assert not checkpoint.get('completed')
+    assert not (tmp_path / 'state.json').exists()
+    assert server.faults_injected == FAST_RETRY.max_attempts
@@ -0,0 +1,194 @@
+# tests/test_sqlite_export.py
+"""SQLite export of processed extension rows."""
+
+import sqlite3
+import sys
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+import data_processor
+from benchmarks.fixtures import write_pages
+from data_processor import ExtensionDataProcessor
+from query_runner import load_queries
+from sqlite_exporter import (NormalizedSchema, PublisherSummary, SearchIndex, SQLiteExporter,
+                             explain_query_plan)
+
+QUERIES_DIR = Path(__file__).resolve().parent.parent / 'queries'
+
+# Index every query in queries/ is expected to be planned with
+QUERY_INDEXES = {
+    'most_active_publishers': 'idx_vscode_extensions_publisherDisplayName',
+    'publishers_per_extensions': 'idx_vscode_extensions_publisherId',
+    'trending': 'idx_vscode_extensions_publishedDate',
+    'unmaintained_extensions': 'idx_vscode_extensions_install',
+}
+
+# Columns of the rows built by make_row
+COLUMNS = ['extensionId', 'publisherId', 'publisherName', 'publisherDisplayName',
+           'extensionName', 'extensionDisplayName', 'shortDescription', 'install',
+           'downloadCount', 'lastUpdated', 'categories', 'tags']
+
+
+@pytest.fixture
+def pages(tmp_path):
+    directory = tmp_path / 'extensions'
+    directory.mkdir()
+    write_pages(str(directory), 300, page_size=100)
+    return directory
+
+
+def make_row(index, install=100, publisher='pub-1', name=None):
+    name = name or f'extension{index}'
+    return [f'ext-{index}', publisher, publisher, publisher.title(), name, name.title(),
+            f'Description {index}', install, install * 2, '2024-01-01', ['Themes'], ['dark']]
+
+
+def tables(db_file):
+    with closing(sqlite3.connect(db_file)) as conn:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+
+
+def count_rows(db_file, table_name='vscode_extensions'):
+    with closing(sqlite3.connect(db_file)) as conn:
+        return conn.execute(f'SELECT count(*) FROM {table_name}').fetchone()[0]
+
+
+def test_positional_csv_file_is_deprecated_and_ignored(pages, tmp_path):
+    db_file = str(tmp_path / 'extensions.db')
+    with pytest.warns(DeprecationWarning):
+        ExtensionDataProcessor(str(pages)).export_to_sqlite('unused.csv', db_file, 'extensions')
+    assert count_rows(db_file, 'extensions') == 300
+
+
+def test_feature_flags_are_keyword_only(pages, tmp_path):
+    with pytest.raises(TypeError):
+        ExtensionDataProcessor(str(pages)).export_to_sqlite(
+            None, str(tmp_path / 'extensions.db'), 'extensions', True)
+
+
+def test_queries_use_their_indexes(pages, tmp_path):
+    db_file = str(tmp_path / 'vscode_extensions.db')
+    ExtensionDataProcessor(str(pages)).export_to_sqlite(db_file=db_file)
+    queries = load_queries(str(QUERIES_DIR))
+    assert set(queries) == set(QUERY_INDEXES)
+    with closing(sqlite3.connect(db_file)) as conn:
+        for name, sql in queries.items():
+            plan = explain_query_plan(conn, sql)
+            assert any(f'USING INDEX {QUERY_INDEXES[name]}' in step for step in plan), \
+                f'{name}: {plan}'
+
+
+def test_full_load_without_normalize_drops_normalized_tables(tmp_path):
+    db_file = str(tmp_path / 'extensions.db')
+    SQLiteExporter(db_file, normalize=True).load(COLUMNS, [make_row(1)])
+    SQLiteExporter(db_file).load(COLUMNS, [make_row(1, install=500)])
+    assert not tables(db_file) & set(NormalizedSchema.tables)
+
+    SQLiteExporter(db_file, normalize=True).upsert(COLUMNS, [make_row(1, install=500)])
+    with closing(sqlite3.connect(db_file)) as conn:
+        assert conn.execute('SELECT install FROM extensions').fetchall() == [(500,)]
+
+
+def test_upsert_without_normalize_drops_normalized_tables(tmp_path):
+    db_file = str(tmp_path / 'extensions.db')
+    SQLiteExporter(db_file, normalize=True).load(COLUMNS, [make_row(1)])
+    SQLiteExporter(db_file).upsert(COLUMNS, [make_row(1, install=999, publisher='pub-9')])
+    assert not tables(db_file) & set(NormalizedSchema.tables)
+
+    SQLiteExporter(db_file, normalize=True).upsert(
+        COLUMNS, [make_row(1, install=999, publisher='pub-9')])
+    with closing(sqlite3.connect(db_file)) as conn:
+        assert conn.execute('SELECT install, publisherId FROM extensions '
+                            'JOIN publishers USING (publisherKey)').fetchall() == [(999, 'pub-9')]
+
+
+def test_full_load_without_search_index_drops_it(tmp_path):
+    db_file = str(tmp_path / 'extensions.db')
+    SQLiteExporter(db_file, search_index=True).load(COLUMNS, [make_row(1)])
+    SQLiteExporter(db_file).load(COLUMNS, [make_row(1, name='renamed')])
+    assert 'vscode_extensions_fts' not in tables(db_file)
+
+    SQLiteExporter(db_file, search_index=True).upsert(COLUMNS, [make_row(1, name='renamed')])
+    with closing(sqlite3.connect(db_file)) as conn:
+        assert [row[0] for row in SearchIndex().search(conn, 'renamed')] == ['ext-1']
+
+
+def test_search_index_without_triggers_does_not_exist(tmp_path):
+    db_file = str(tmp_path / 'extensions.db')
+    SQLiteExporter(db_file, search_index=True).load(COLUMNS, [make_row(1)])
+    with closing(sqlite3.connect(db_file)) as conn:
+        assert SearchIndex().exists(conn)
+        conn.execute('DROP TRIGGER vscode_extensions_fts_au')
+        assert not SearchIndex().exists(conn)
+
+
+def index_segments(db_file):
+    with closing(sqlite3.connect(db_file)) as conn:
+        return conn.execute('SELECT * FROM vscode_extensions_fts_data').fetchall()
+
+
+def test_statistics_only_upsert_leaves_search_index_alone(tmp_path):
+    db_file = str(tmp_path / 'extensions.db')
+    exporter = SQLiteExporter(db_file, search_index=True)
+    exporter.load(COLUMNS, [make_row(1), make_row(2)])
+    segments = index_segments(db_file)
+
+    exporter.upsert(COLUMNS, [make_row(1, install=500), make_row(2, install=500)])
+    assert index_segments(db_file) == segments
+
+    exporter.upsert(COLUMNS, [make_row(1, install=500), make_row(2, install=500, name='renamed')])
+    assert index_segments(db_file) != segments
+    with closing(sqlite3.connect(db_file)) as conn:
+        assert [row[0] for row in SearchIndex().search(conn, 'renamed')] == ['ext-2']
+
+
+def rollups(db_file):
+    with closing(sqlite3.connect(db_file)) as conn:
+        return (conn.execute('SELECT * FROM publisher_summary ORDER BY publisherId').fetchall(),
+                conn.execute('SELECT * FROM publisher_extension_histogram '
+                             'ORDER BY extensionCount').fetchall())
+
+
+def test_publisher_rollups_follow_upserts(tmp_path):
+    db_file = str(tmp_path / 'extensions.db')
+    exporter = SQLiteExporter(db_file, publisher_summary=True)
+    exporter.load(COLUMNS, [make_row(1), make_row(2), make_row(3, publisher='pub-2')])
+    rows = [make_row(1, install=500), make_row(2, publisher='pub-2'),
+            make_row(3, publisher='pub-2'), make_row(4, publisher='pub-3')]
+    exporter.upsert(COLUMNS, rows)
+
+    expected = str(tmp_path / 'expected.db')
+    SQLiteExporter(expected, publisher_summary=True).load(COLUMNS, rows)
+    assert rollups(db_file) == rollups(expected)
+
+
+def test_full_load_without_publisher_summary_drops_it(tmp_path):
+    db_file = str(tmp_path / 'extensions.db')
+    SQLiteExporter(db_file, publisher_summary=True).load(COLUMNS, [make_row(1)])
+    SQLiteExporter(db_file).load(COLUMNS, [make_row(1), make_row(2)])
+    assert not tables(db_file) & {PublisherSummary.summary_table,
+                                  PublisherSummary.histogram_table}
+
+    exporter = SQLiteExporter(db_file, publisher_summary=True)
+    exporter.upsert(COLUMNS, [make_row(1), make_row(2)])
+    with closing(sqlite3.connect(db_file)) as conn:
+        assert PublisherSummary().exists(conn)
+    assert rollups(db_file) == ([('pub-1', 'Pub-1', 2, 400, '2024-01-01', '2024-01-01')],
+                                [(2, 1)])
+
+
+def test_command_line_refreshes_incrementally(pages, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    db_file = str(tmp_path / 'extensions.db')
+    for _ in range(2):
+        monkeypatch.setattr(sys, 'argv', [
+            'data_processor.py', '--extensions-dir', str(pages), '--workers', '1',
+            '--db', db_file, '--incremental', '--search-index', '--publisher-summary',
+            '--record-statistics'])
+        data_processor.main()
+    assert count_rows(db_file) == 300
+    assert {'vscode_extensions_fts', 'publisher_summary', 'extension_statistics'} <= \
+        tables(db_file)
+    assert count_rows(db_file, 'extension_statistics') == 300
@@ -0,0 +1,59 @@
+# tests/test_statistics_history.py
+"""Delta-encoded statistics snapshots."""
+
+import sqlite3
+from contextlib import closing
+
+from statistics_history import StatisticsHistory
+
+COLUMNS = ['extensionId', 'install', 'averagerating']
+
+
+def test_series_records_changes_and_removals(tmp_path):
+    history = StatisticsHistory(str(tmp_path / 'history.db'))
+    history.record(COLUMNS, [['ext-1', 10, 4.5]], crawled_at='2024-01-01')
+    history.record(COLUMNS, [['ext-1', 10, 4.5]], crawled_at='2024-01-02')
+    history.record(COLUMNS, [['ext-1', 20, None]], crawled_at='2024-01-03')
+    history.record(COLUMNS, [['ext-1', 20, 4.0]], crawled_at='2024-01-04')
+
+    assert history.series('ext-1', 'install') == [('2024-01-01', 10), ('2024-01-03', 20)]
+    assert history.series('ext-1', 'averagerating') == [
+        ('2024-01-01', 4.5), ('2024-01-03', None), ('2024-01-04', 4.0)]
+
+
+def test_unchanged_snapshot_writes_no_rows(tmp_path):
+    history = StatisticsHistory(str(tmp_path / 'history.db'))
+    assert history.record(COLUMNS, [['ext-1', 10, 4.5]], crawled_at='2024-01-01') == 1
+    assert history.record(COLUMNS, [['ext-1', 10, 4.5]], crawled_at='2024-01-02') == 0
+
+
+def test_histories_without_bitmask_are_migrated(tmp_path):
+    db_file = str(tmp_path / 'history.db')
+    statistics = ', '.join(f'"{column}"' for column in
+                           ('install', 'averagerating', 'ratingcount', 'trendingdaily',
+                            'trendingmonthly', 'trendingweekly', 'weightedRating',
+                            'updateCount', 'downloadCount'))
+    with closing(sqlite3.connect(db_file)) as conn:
+        conn.execute(f'CREATE TABLE extension_statistics ("extensionId" TEXT NOT NULL, '
+                     f'"crawledAt" TEXT NOT NULL, {statistics}, '
+                     f'PRIMARY KEY ("extensionId", "crawledAt")) WITHOUT ROWID')
+        conn.execute('INSERT INTO extension_statistics ("extensionId", "crawledAt", install) '
+                     "VALUES ('ext-1', '2024-01-01', 10)")
+        conn.commit()
+
+    history = StatisticsHistory(db_file)
+    history.record(COLUMNS, [['ext-1', 20, None]], crawled_at='2024-01-02')
+    assert history.series('ext-1', 'install') == [('2024-01-01', 10), ('2024-01-02', 20)]
+    assert history.series('ext-1', 'averagerating') == []
+
+
+def test_statistics_missing_from_columns_keep_their_values(tmp_path):
+    history = StatisticsHistory(str(tmp_path / 'history.db'))
+    history.record(['extensionId', 'install', 'weightedRating'], [['e1', 10, 4.2]],
+                   crawled_at='2024-01-01')
+    assert history.record(['extensionId', 'install'], [['e1', 10]],
+                          crawled_at='2024-01-02') == 0
+    history.record(['extensionId', 'install'], [['e1', 20]], crawled_at='2024-01-03')
+
+    assert history.series('e1', 'weightedRating') == [('2024-01-01', 4.2)]
+    assert history.series('e1', 'install') == [('2024-01-01', 10), ('2024-01-03', 20)]
@@ -0,0 +1,42 @@
+# tests/test_stream_store.py
+"""Freshest-copy selection over the append-only stream store."""
+
+from benchmarks.fixtures import make_extension
+from data_processor import ExtensionDataProcessor
+from page_storage import StreamStore
+
+
+def install_count(extension, value):
+    for statistic in extension['statistics']:
+        if statistic['statisticName'] == 'install':
+            statistic['value'] = value
+    return extension
+
+
+def installs(directory):
+    processor = ExtensionDataProcessor(str(directory))
+    column = list(processor.fields.FIELD_MAPPING).index('install')
+    return [row[column] for row in processor.iter_rows()]
+
+
+def test_later_line_wins_tie(tmp_path):
+    store = StreamStore(str(tmp_path), rotate_bytes=1 << 20)
+    store.save(1, [install_count(make_extension(0), 1)])
+    store.save(2, [install_count(make_extension(0), 999)])
+    assert installs(tmp_path) == [999]
+
+
+def test_later_segment_wins_tie(tmp_path):
+    store = StreamStore(str(tmp_path), rotate_bytes=1)
+    store.save(1, [install_count(make_extension(0), 1)])
+    store.save(2, [install_count(make_extension(0), 999)])
+    assert len(store._segments()) == 2
+    assert installs(tmp_path) == [999]
+
+
+def test_clear_removes_segments(tmp_path):
+    store = StreamStore(str(tmp_path), rotate_bytes=1)
+    store.save(1, [make_extension(0)])
+    store.save(2, [make_extension(1)])
+    store.clear()
+    assert store._segments() == []
@@ -0,0 +1,54 @@
+# tests/test_updates.py
+"""High-water mark handling of full and incremental crawls against the stub server."""
+
+import json
+
+import pytest
+
+from benchmarks.stub_server import start_stub_server
+from marketplace_crawler import MarketplaceConfig, MarketplaceCrawler, earliest_timestamp
+
+MARK = '2024-06-01T00:00:00Z'
+
+
+@pytest.fixture
+def crawler(tmp_path):
+    server, url = start_stub_server(latency=0, total_extensions=3000)
+    crawler = MarketplaceCrawler(MarketplaceConfig(
+        url=url, output_dir=str(tmp_path / 'extensions'),
+        state_file=str(tmp_path / 'state.json'),
+        checkpoint_file=str(tmp_path / 'checkpoint.json')))
+    yield crawler
+    crawler.close()
+    server.shutdown()
+
+
+def high_water_mark(tmp_path):
+    return json.loads((tmp_path / 'state.json').read_text())['lastUpdated']
+
+
+def test_mark_is_kept_when_max_pages_stops_the_update(tmp_path, crawler):
+    (tmp_path / 'state.json').write_text(json.dumps({'lastUpdated': MARK}))
+    assert crawler.crawl_updates(max_pages=1) == 1000
+    assert high_water_mark(tmp_path) == MARK
+
+
+def test_mark_moves_once_the_update_reaches_it(tmp_path, crawler):
+    (tmp_path / 'state.json').write_text(json.dumps({'lastUpdated': MARK}))
+    changed = crawler.crawl_updates(max_pages=10)
+    assert 1000 < changed < 3000
+    assert high_water_mark(tmp_path) > MARK
+
+
+def test_full_crawl_mark_is_not_after_its_start(tmp_path, crawler, monkeypatch):
+    monkeypatch.setattr('marketplace_crawler.utc_timestamp', lambda: '2024-03-01T00:00:00Z')
+    crawler.crawl(max_pages=10)
+    assert high_water_mark(tmp_path) == '2024-03-01T00:00:00Z'
+    assert json.loads((tmp_path / 'checkpoint.json').read_text())['startedAt'] == \
+        '2024-03-01T00:00:00Z'
+
+
+def test_earliest_timestamp_ignores_missing_values():
+    assert earliest_timestamp(None, '2024-05-01T10:00:00.17Z', '2024-06-01T00:00:00Z') == \
+        '2024-05-01T10:00:00.17Z'
+    assert earliest_timestamp(None) is None